@@ -1,26 +1,67 @@
 """FastAPI Application for Exabomination API."""
 
 import logging
-import uuid
+import queue
+import secrets
 import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Callable
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from frontend.api.routes import router
-from frontend.api.auth import RateLimitMiddleware
+from frontend.api.routes import router, service
+from frontend.api.auth import RateLimitMiddleware, init_rate_limit_store
+from frontend.api.context import REQUEST_ID, add_request_id_filter, configure_logging
+from src.config import CORS_ALLOWED_ORIGINS
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configure logging. Thread and process details are not used in the log
+# format, so skip collecting them for every record.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+configure_logging(logging.INFO)
 
 logger = logging.getLogger(__name__)
 
+# Background listener that writes queued log records, set on startup
+log_listener = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def start_queue_logging(maxsize: int = 10000) -> QueueListener:
+    """Move the root logger's handlers behind a queue drained by a background thread.
+    
+    Request handlers then only enqueue log records, so slow stream or file
+    writes never block the event loop.
+    
+    Args:
+        maxsize: Maximum number of pending log records
+        
+    Returns:
+        The started queue listener
+    """
+    root = logging.getLogger()
+    log_queue = queue.Queue(maxsize=maxsize)
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    # The request ID must be captured here, on the thread that logged the
+    # record, before the listener thread replays it
+    root.handlers = [add_request_id_filter(DroppingQueueHandler(log_queue))]
+    listener.start()
+    return listener
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Exabomination API",
@@ -29,21 +70,59 @@ app = FastAPI(
     docs_url="/v1/docs",
     redoc_url="/v1/redoc",
     openapi_url="/v1/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
-# Add CORS middleware
+# Add CORS middleware. Clients authenticate with bearer tokens rather than
+# cookies, so credentials are not needed.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, this should be restricted
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ALLOWED_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
 )
 
 # Add rate limit middleware
 app.add_middleware(RateLimitMiddleware)
 
 
+@app.on_event("startup")
+async def startup_rate_limit_store():
+    """Connect the shared rate limit store on startup."""
+    await init_rate_limit_store()
+
+
+@app.on_event("startup")
+async def startup_service_warmup():
+    """Open the search backend connections before serving requests."""
+    await service.warmup()
+
+
+@app.on_event("startup")
+async def startup_queue_logging():
+    """Route log records through a background writer thread on startup."""
+    global log_listener
+    if log_listener is None:
+        log_listener = start_queue_logging()
+
+
+@app.on_event("shutdown")
+async def shutdown_service():
+    """Write out pending feedback and query history on shutdown."""
+    await service.close()
+
+
+@app.on_event("shutdown")
+async def shutdown_queue_logging():
+    """Flush pending log records and restore direct logging on shutdown."""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        logging.getLogger().handlers = list(log_listener.handlers)
+        log_listener = None
+
+
 # Add request ID middleware
 @app.middleware("http")
 async def add_request_id(request: Request, call_next: Callable) -> Response:
@@ -59,15 +138,20 @@ async def add_request_id(request: Request, call_next: Callable) -> Response:
     # Generate request ID if not present
     request_id = request.headers.get("X-Request-ID")
     if not request_id:
-        request_id = f"req_{uuid.uuid4().hex[:12]}"
+        request_id = f"req_{secrets.token_hex(6)}"
         
-    # Add request ID to request state
-    request.state.request_id = request_id
+    # Read the wall clock once per request; downstream middleware reuses it
+    request.state.now = time.time()
+    
+    # Expose request ID to downstream code. If the request raises, the ID is
+    # left set so the outermost server error handler can still report it.
+    token = REQUEST_ID.set(request_id)
     
     # Process request and add ID to response headers
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
+    REQUEST_ID.reset(token)
     
     response.headers["X-Request-ID"] = request_id
     response.headers["X-Process-Time"] = str(process_time)
@@ -91,10 +175,10 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     Returns:
         JSON response
     """
-    logger.error(f"HTTP error: {exc.status_code} - {exc.detail}")
+    logger.error("HTTP error: %s - %s", exc.status_code, exc.detail)
     
     # Get request ID
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = REQUEST_ID.get()
     
     # Format error response
     error_content = {
@@ -105,7 +189,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         "request_id": request_id
     }
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=error_content
     )
@@ -122,10 +206,10 @@ async def general_exception_handler(request: Request, exc: Exception):
     Returns:
         JSON response
     """
-    logger.error(f"Unhandled exception: {str(exc)}")
+    logger.error("Unhandled exception: %s", exc)
     
     # Get request ID
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = REQUEST_ID.get()
     
     # Format error response
     error_content = {
@@ -136,7 +220,7 @@ async def general_exception_handler(request: Request, exc: Exception):
         "request_id": request_id
     }
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=error_content
     )
@@ -148,6 +232,7 @@ async def health_check():
     """Health check endpoint.
     
     Returns:
-        Health status
+        Health status, including whether the search service has warmed up
+        and its answer cache statistics
     """
-    return {"status": "ok", "timestamp": time.time()}
\ No newline at end of file
+    return {"status": "ok", "ready": service.ready, "cache": service.get_cache_stats(), "timestamp": time.time()}
\ No newline at end of file
@@ -1,38 +1,188 @@
 """Authentication middleware for API."""
 
 import time
-from typing import Optional, Dict, List, Callable
-from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Callable, Tuple
+from datetime import datetime
 import hashlib
-import os
+import inspect
+import uuid
 import json
 import logging
-from functools import wraps
+from functools import wraps, lru_cache
 
 from fastapi import Request, HTTPException, Depends
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
+from cachetools import TTLCache
 from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_429_TOO_MANY_REQUESTS
 )
 
-from src.config import API_RATE_LIMIT, API_CONCURRENT_LIMIT
+from src.config import API_RATE_LIMIT, API_CONCURRENT_LIMIT, REDIS_URL, DEBUG_MODE
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import NoScriptError, RedisError
+except ImportError:
+    aioredis = None
+    NoScriptError = RedisError = None
 
 logger = logging.getLogger(__name__)
 
 # Simple in-memory session storage
 # In production, this should be replaced with a database or Redis
+# Lookups go through the memoized _resolve_api_key(), so remove keys with
+# revoke_api_key() rather than editing this mapping directly
 api_key_storage = {}  # Maps API keys to user info
 session_storage = {}  # Maps session tokens to user info
-rate_limit_storage = {}  # Maps API keys to rate limit info
-concurrent_request_count = {}  # Maps API keys to current concurrent request count
+# Rate limit entries expire once idle; a bucket idle for over a minute is full
+# again anyway, so evicting it loses nothing and keeps memory bounded
+rate_limit_storage = TTLCache(maxsize=100_000, ttl=120)  # Maps API keys to (tokens, last_refill) token buckets
+concurrent_request_count = TTLCache(maxsize=100_000, ttl=300)  # Maps API keys to current concurrent request count
+
+# Maximum number of API keys auto-registered in DEBUG_MODE
+MAX_DEBUG_API_KEYS = 10_000
+
+# Token bucket parameters: a full bucket allows a burst of API_RATE_LIMIT
+# requests and refills at API_RATE_LIMIT tokens per minute
+RATE_LIMIT_CAPACITY = float(API_RATE_LIMIT)
+RATE_LIMIT_REFILL_RATE = API_RATE_LIMIT / 60.0
+RATE_LIMIT_HEADER = str(API_RATE_LIMIT)
+
+# Session lifetime and how close to expiry a session is extended (seconds)
+SESSION_DURATION = 24 * 60 * 60
+SESSION_REFRESH_WINDOW = 60 * 60
+
+# Per-key session details (everything but the rate limit) are reused for a
+# few seconds so repeated status polls from the UI skip rebuilding them
+SESSION_PROFILE_TTL = 10
+session_profile_cache = TTLCache(maxsize=100_000, ttl=SESSION_PROFILE_TTL)
+
+# Admission outcomes for a rate limited request
+ADMITTED = 1
+RATE_LIMITED = 0
+CONCURRENCY_LIMITED = -1
+
+# Seconds before an orphaned concurrent request counter expires in Redis
+CONCURRENT_KEY_TTL = 300
+
+# Admission check evaluated atomically inside Redis so that all workers share
+# the same limits. KEYS are (token bucket hash, concurrent request counter);
+# ARGV is (now, capacity, refill rate, consume, concurrent limit). With
+# consume='0' the bucket is only refilled and read. Returns {status, tokens}
+# with tokens as a string since Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or capacity
+local last_refill = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - last_refill) * rate)
+local status = 0
+if ARGV[4] == '1' and tokens >= 1 then
+    local concurrent = redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], %d)
+    if concurrent > tonumber(ARGV[5]) then
+        redis.call('DECR', KEYS[2])
+        status = -1
+    else
+        tokens = tokens - 1
+        status = 1
+    end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_refill', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {status, tostring(tokens)}
+""" % CONCURRENT_KEY_TTL
+
+# Redis client and cached script SHA, set by init_rate_limit_store()
+redis_client = None
+token_bucket_sha = None
+
+# Longest accepted API key; longer bearer tokens are rejected before any lookup
+MAX_API_KEY_LENGTH = 256
+
+# Paths that are never rate limited (API docs and health checks)
+RATE_LIMIT_EXEMPT_PATHS = frozenset({
+    "/v1/docs",
+    "/v1/redoc",
+    "/v1/openapi.json",
+    "/health"
+})
 
 # Security bearer token scheme
 security = HTTPBearer()
 
 
+def _new_request_id() -> str:
+    """Generate a unique request ID for error responses."""
+    return f"req_{uuid.uuid4().hex[:12]}"
+
+
+@lru_cache(maxsize=10000)
+def _resolve_api_key(api_key: str) -> Dict:
+    """Resolve an API key to its user info.
+    
+    Successful lookups are memoized, so the permission check and session
+    status reuse the user info resolved during authentication; invalid keys
+    raise and are not cached, so they are re-checked on the next request.
+    
+    Args:
+        api_key: API key
+        
+    Returns:
+        User info for the API key
+        
+    Raises:
+        HTTPException: If the API key is invalid
+    """
+    # In a real implementation, you would validate the API key against a database
+    # For now, we'll just check if it's in our simple in-memory storage
+    user_info = api_key_storage.get(api_key)
+    if user_info is not None:
+        return user_info
+    
+    # For testing purposes, automatically register new API keys
+    # In production, this should be removed
+    if DEBUG_MODE and len(api_key_storage) < MAX_DEBUG_API_KEYS:
+        # Create a new user entry for this API key
+        user_info = {
+            "user_id": f"usr_{hashlib.md5(api_key.encode()).hexdigest()[:8]}",
+            "account_tier": "standard",
+            "features_enabled": frozenset([
+                "basic_search",     # Add basic_search permission
+                "advanced_filtering",
+                "query_history", 
+                "feedback", 
+                "suggestions"
+            ])
+        }
+        api_key_storage[api_key] = user_info
+        logger.info("Registered new API key for testing: %s...", api_key[:8])
+        return user_info
+    
+    logger.warning("Invalid API key: %s...", api_key[:8])
+    raise HTTPException(
+        status_code=HTTP_401_UNAUTHORIZED,
+        detail="Invalid API key"
+    )
+
+
+def revoke_api_key(api_key: str):
+    """Remove an API key so that later requests with it are rejected.
+    
+    Args:
+        api_key: API key
+    """
+    api_key_storage.pop(api_key, None)
+    session_profile_cache.pop(api_key, None)
+    _resolve_api_key.cache_clear()
+
+
 def get_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Extract and validate API key from authorization header.
     
@@ -53,36 +203,138 @@ def get_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)) -
         )
     
     api_key = credentials.credentials
-    
-    # In a real implementation, you would validate the API key against a database
-    # For now, we'll just check if it's in our simple in-memory storage
-    if api_key not in api_key_storage:
-        # For testing purposes, automatically register new API keys
-        # In production, this should be removed
-        if os.getenv("DEBUG_MODE", "False").lower() in ("true", "t", "1"):
-            # Create a new user entry for this API key
-            api_key_storage[api_key] = {
-                "user_id": f"usr_{hashlib.md5(api_key.encode()).hexdigest()[:8]}",
-                "account_tier": "standard",
-                "features_enabled": [
-                    "basic_search",     # Add basic_search permission
-                    "advanced_filtering",
-                    "query_history", 
-                    "feedback", 
-                    "suggestions"
-                ]
-            }
-            logger.info(f"Registered new API key for testing: {api_key[:8]}...")
-        else:
-            logger.warning(f"Invalid API key: {api_key[:8]}...")
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail="Invalid API key"
-            )
+    if len(api_key) > MAX_API_KEY_LENGTH:
+        logger.warning("Malformed API key in request")
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key"
+        )
+    _resolve_api_key(api_key)
     
     return api_key
 
 
+def _refill_tokens(api_key: str, now: float) -> float:
+    """Return the number of tokens currently available for an API key.
+    
+    Args:
+        api_key: API key
+        now: Current timestamp
+        
+    Returns:
+        Available tokens after refilling for the time elapsed since the last refill
+    """
+    tokens, last_refill = rate_limit_storage.get(api_key, (RATE_LIMIT_CAPACITY, now))
+    return min(RATE_LIMIT_CAPACITY, tokens + (now - last_refill) * RATE_LIMIT_REFILL_RATE)
+
+
+async def init_rate_limit_store():
+    """Connect to Redis and load the token bucket script if REDIS_URL is set.
+    
+    Falls back to the in-memory token buckets when Redis is not configured,
+    the client library is missing, or the server cannot be reached.
+    """
+    global redis_client, token_bucket_sha
+    
+    if not REDIS_URL:
+        return
+    if aioredis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory rate limits")
+        return
+    
+    try:
+        client = aioredis.from_url(REDIS_URL)
+        token_bucket_sha = await client.script_load(TOKEN_BUCKET_SCRIPT)
+        redis_client = client
+        logger.info("Using Redis for rate limit state")
+    except Exception as e:
+        logger.warning("Failed to connect to Redis, using in-memory rate limits: %s", e)
+
+
+async def _eval_token_bucket(api_key: str, now: float, consume: bool) -> Tuple[int, float]:
+    """Run the admission script in Redis.
+    
+    Args:
+        api_key: API key
+        now: Current timestamp
+        consume: Whether to admit the request, taking a token and a
+            concurrent request slot if both are available
+        
+    Returns:
+        Tuple of (admission status, tokens remaining)
+    """
+    global token_bucket_sha
+    
+    keys = (f"rl:{api_key}", f"rlc:{api_key}")
+    args = (now, RATE_LIMIT_CAPACITY, RATE_LIMIT_REFILL_RATE, "1" if consume else "0", API_CONCURRENT_LIMIT)
+    try:
+        status, tokens = await redis_client.evalsha(token_bucket_sha, 2, *keys, *args)
+    except NoScriptError:
+        # Script cache was flushed (e.g. Redis restart); reload and retry once
+        token_bucket_sha = await redis_client.script_load(TOKEN_BUCKET_SCRIPT)
+        status, tokens = await redis_client.evalsha(token_bucket_sha, 2, *keys, *args)
+    return int(status), float(tokens)
+
+
+async def _admit_request(api_key: str, now: float) -> Tuple[int, float, bool]:
+    """Check the rate and concurrency limits and admit the request if allowed.
+    
+    An admitted request holds a token and a concurrent request slot; the
+    slot must be returned with _release_request(). If Redis fails, the
+    request is checked against the in-memory token bucket instead.
+    
+    Args:
+        api_key: API key
+        now: Current timestamp
+        
+    Returns:
+        Tuple of (admission status, tokens remaining, whether the concurrent
+        request slot is held in Redis)
+    """
+    if redis_client is not None:
+        try:
+            status, tokens = await _eval_token_bucket(api_key, now, consume=True)
+            return status, tokens, True
+        except RedisError as e:
+            logger.warning("Redis rate limit check failed, using in-memory rate limits: %s", e)
+    
+    tokens = _refill_tokens(api_key, now)
+    if tokens < 1:
+        rate_limit_storage[api_key] = (tokens, now)
+        return RATE_LIMITED, tokens, False
+    
+    # There is no await between reading and writing the counter, so the
+    # check-and-increment is atomic on the event loop
+    concurrent = concurrent_request_count.get(api_key, 0)
+    if concurrent >= API_CONCURRENT_LIMIT:
+        rate_limit_storage[api_key] = (tokens, now)
+        return CONCURRENCY_LIMITED, tokens, False
+    
+    concurrent_request_count[api_key] = concurrent + 1
+    tokens -= 1
+    rate_limit_storage[api_key] = (tokens, now)
+    return ADMITTED, tokens, False
+
+
+async def _release_request(api_key: str, shared: bool):
+    """Return the concurrent request slot held by an admitted request.
+    
+    A failure to release the slot in Redis is only logged; the counter
+    expires after CONCURRENT_KEY_TTL seconds.
+    
+    Args:
+        api_key: API key
+        shared: Whether the slot is held in Redis
+    """
+    if shared:
+        try:
+            await redis_client.decr(f"rlc:{api_key}")
+        except RedisError as e:
+            logger.warning("Failed to release concurrent request slot in Redis: %s", e)
+    else:
+        concurrent_request_count[api_key] = concurrent_request_count.get(api_key, 1) - 1
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Middleware for enforcing rate limits on API requests."""
     
@@ -94,13 +346,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             call_next: The next handler in the middleware chain
             
         Returns:
-            The response from the next handler
-            
-        Raises:
-            HTTPException: If the rate limit is exceeded
+            The response from the next handler, or a 429 response if a
+            rate or concurrency limit is exceeded
         """
-        # Skip rate limiting for non-API routes
-        if not request.url.path.startswith("/v1"):
+        # Skip rate limiting for non-API routes and documentation
+        path = request.url.path
+        if path in RATE_LIMIT_EXEMPT_PATHS or not path.startswith("/v1"):
             return await call_next(request)
         
         # Get API key from auth header
@@ -109,32 +360,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             # Let the auth middleware handle this case
             return await call_next(request)
         
-        api_key = auth_header.replace("Bearer ", "")
-        
-        # Check and update rate limits
-        now = time.time()
-        
-        # Initialize rate limit info if not exists
-        if api_key not in rate_limit_storage:
-            rate_limit_storage[api_key] = {
-                "count": 0,
-                "reset_at": now + 60,  # Reset after 60 seconds
-                "requests": []  # List of timestamps for rolling window
-            }
+        api_key = auth_header[7:]
+        if len(api_key) > MAX_API_KEY_LENGTH:
+            # Malformed key; the auth dependency rejects it without creating any state
+            return await call_next(request)
         
-        # Clean up old requests from rolling window
-        rate_limit_storage[api_key]["requests"] = [
-            ts for ts in rate_limit_storage[api_key]["requests"]
-            if ts > now - 60  # Keep requests from the last 60 seconds
-        ]
+        # Check and update rate limits using the request's start time
+        now = getattr(request.state, "now", None) or time.time()
+        status, tokens, shared = await _admit_request(api_key, now)
         
         # Check if rate limit exceeded
-        if len(rate_limit_storage[api_key]["requests"]) >= API_RATE_LIMIT:
-            # Reset time is the oldest request time + 60 seconds
-            reset_at = rate_limit_storage[api_key]["requests"][0] + 60
+        if status == RATE_LIMITED:
+            # Reset time is when the next token becomes available
+            reset_at = now + (1 - tokens) / RATE_LIMIT_REFILL_RATE
             reset_at_iso = datetime.fromtimestamp(reset_at).isoformat()
             
-            logger.warning(f"Rate limit exceeded for API key: {api_key[:8]}...")
+            logger.warning("Rate limit exceeded for API key: %s...", api_key[:8])
             
             # Return rate limit error
             error_response = {
@@ -146,19 +387,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "reset_at": reset_at_iso
                     }
                 },
-                "request_id": f"req_{hashlib.md5(str(now).encode()).hexdigest()[:12]}"
+                "request_id": _new_request_id()
             }
             
-            return HTTPException(
+            return JSONResponse(
                 status_code=HTTP_429_TOO_MANY_REQUESTS,
-                detail=error_response
+                content=error_response,
+                headers={"Retry-After": str(max(1, int(reset_at - now)))}
             )
         
         # Check concurrent request limit
-        if api_key not in concurrent_request_count:
-            concurrent_request_count[api_key] = 0
-            
-        if concurrent_request_count[api_key] >= API_CONCURRENT_LIMIT:
+        if status == CONCURRENCY_LIMITED:
             error_response = {
                 "error": {
                     "code": "concurrent_limit_exceeded",
@@ -167,59 +406,64 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "limit": API_CONCURRENT_LIMIT
                     }
                 },
-                "request_id": f"req_{hashlib.md5(str(now).encode()).hexdigest()[:12]}"
+                "request_id": _new_request_id()
             }
             
-            return HTTPException(
+            return JSONResponse(
                 status_code=HTTP_429_TOO_MANY_REQUESTS,
-                detail=error_response
+                content=error_response,
+                headers={"Retry-After": "1"}
             )
-            
-        # Update rate limit counters
-        rate_limit_storage[api_key]["requests"].append(now)
-        concurrent_request_count[api_key] += 1
         
         try:
             # Process the request
             response = await call_next(request)
             
             # Add rate limit headers to the response
-            remaining = API_RATE_LIMIT - len(rate_limit_storage[api_key]["requests"])
-            response.headers["X-Rate-Limit-Limit"] = str(API_RATE_LIMIT)
-            response.headers["X-Rate-Limit-Remaining"] = str(remaining)
-            response.headers["X-Rate-Limit-Reset"] = str(int(rate_limit_storage[api_key]["reset_at"]))
+            reset_at = now + max(0.0, 1 - tokens) / RATE_LIMIT_REFILL_RATE
+            headers = response.headers
+            headers["X-Rate-Limit-Limit"] = RATE_LIMIT_HEADER
+            headers["X-Rate-Limit-Remaining"] = str(int(tokens))
+            headers["X-Rate-Limit-Reset"] = str(int(reset_at))
             
             return response
         finally:
             # Decrement concurrent request count
-            concurrent_request_count[api_key] -= 1
+            await _release_request(api_key, shared)
 
 
 def check_permissions(required_permissions: List[str]):
     """Decorator to check if user has required permissions.
     
+    The decorated endpoint must declare an ``api_key = Depends(get_api_key)``
+    parameter. FastAPI resolves that dependency once and passes it to the
+    wrapper, so authentication is not repeated by the permission check.
+    
     Args:
         required_permissions: List of permissions required for the endpoint
         
     Returns:
         Decorator function
     """
+    required = frozenset(required_permissions)
+    
     def decorator(func: Callable):
+        if "api_key" not in inspect.signature(func).parameters:
+            raise TypeError(f"{func.__name__} must declare an api_key parameter to use check_permissions")
+        
         @wraps(func)
-        async def wrapper(*args, api_key: str = Depends(get_api_key), **kwargs):
-            # Get user info from API key
-            user_info = api_key_storage.get(api_key, {})
+        async def wrapper(*args, **kwargs):
+            # Get user info from the API key resolved for the endpoint
+            api_key = kwargs["api_key"]
+            user_info = _resolve_api_key(api_key)
             account_tier = user_info.get("account_tier", "standard")
-            features_enabled = user_info.get("features_enabled", [])
+            features_enabled = user_info.get("features_enabled", frozenset())
             
             # Check if user has all required permissions
-            missing_permissions = [
-                perm for perm in required_permissions
-                if perm not in features_enabled
-            ]
+            missing_permissions = required.difference(features_enabled)
             
             if missing_permissions:
-                logger.warning(f"Permission denied for API key: {api_key[:8]}...")
+                logger.warning("Permission denied for API key: %s...", api_key[:8])
                 raise HTTPException(
                     status_code=HTTP_403_FORBIDDEN,
                     detail={
@@ -227,64 +471,86 @@ def check_permissions(required_permissions: List[str]):
                             "code": "insufficient_permissions",
                             "message": "Insufficient permissions",
                             "details": {
-                                "missing_permissions": missing_permissions,
+                                "missing_permissions": sorted(missing_permissions),
                                 "account_tier": account_tier
                             }
                         },
-                        "request_id": f"req_{hashlib.md5(str(time.time()).encode()).hexdigest()[:12]}"
+                        "request_id": _new_request_id()
                     }
                 )
             
-            return await func(*args, api_key=api_key, **kwargs)
+            return await func(*args, **kwargs)
         
         return wrapper
     
     return decorator
 
 
-def get_session_status(api_key: str) -> Dict:
-    """Get session status for a user.
+def _session_profile(api_key: str, now: float) -> Dict:
+    """Get the session details of a user that do not depend on the rate limit.
     
     Args:
         api_key: API key
+        now: Current time
         
     Returns:
-        Session status information
+        Session details, cached for SESSION_PROFILE_TTL seconds
     """
+    profile = session_profile_cache.get(api_key)
+    if profile is not None:
+        return profile
+    
     # Get user info
-    user_info = api_key_storage.get(api_key, {})
-    user_id = user_info.get("user_id", f"usr_{hashlib.md5(api_key.encode()).hexdigest()[:8]}")
-    account_tier = user_info.get("account_tier", "standard")
-    features_enabled = user_info.get("features_enabled", [])
+    user_info = _resolve_api_key(api_key)
     
-    # Get rate limit info
-    now = time.time()
-    rate_info = rate_limit_storage.get(api_key, {
-        "requests": [],
-        "reset_at": now + 60
-    })
+    # Session expires 24 hours after it was last extended; the formatted
+    # timestamp is cached and only refreshed when less than an hour remains
+    session_expires = user_info.get("session_expires")
+    if session_expires is None or session_expires[0] - now < SESSION_REFRESH_WINDOW:
+        expires_at = now + SESSION_DURATION
+        session_expires = (expires_at, datetime.fromtimestamp(expires_at).isoformat())
+        user_info["session_expires"] = session_expires
     
-    # Clean up old requests
-    rate_info["requests"] = [
-        ts for ts in rate_info.get("requests", [])
-        if ts > now - 60
-    ]
+    profile = {
+        "authenticated": True,
+        "user_id": user_info.get("user_id", f"usr_{hashlib.md5(api_key.encode()).hexdigest()[:8]}"),
+        "session_expires_at": session_expires[1],
+        "account_tier": user_info.get("account_tier", "standard"),
+        "features_enabled": sorted(user_info.get("features_enabled", frozenset()))
+    }
+    session_profile_cache[api_key] = profile
+    return profile
+
+
+async def get_session_status(api_key: str) -> Dict:
+    """Get session status for a user.
+    
+    Args:
+        api_key: API key
+        
+    Returns:
+        Session status information
+    """
+    now = time.time()
     
-    # Calculate remaining requests
-    remaining = API_RATE_LIMIT - len(rate_info["requests"])
+    # Get rate limit info
+    tokens = None
+    if redis_client is not None:
+        try:
+            _, tokens = await _eval_token_bucket(api_key, now, consume=False)
+        except RedisError as e:
+            logger.warning("Redis rate limit check failed, using in-memory rate limits: %s", e)
+    if tokens is None:
+        tokens = _refill_tokens(api_key, now)
     
-    # Calculate session expiration (24 hours from now)
-    session_expires_at = datetime.now() + timedelta(hours=24)
+    # Calculate remaining requests and when the next token becomes available
+    remaining = int(tokens)
+    reset_at = now + max(0.0, 1 - tokens) / RATE_LIMIT_REFILL_RATE
     
-    return {
-        "authenticated": True,
-        "user_id": user_id,
-        "session_expires_at": session_expires_at.isoformat(),
-        "rate_limit": {
-            "limit": API_RATE_LIMIT,
-            "remaining": remaining,
-            "reset_at": datetime.fromtimestamp(rate_info["reset_at"]).isoformat()
-        },
-        "account_tier": account_tier,
-        "features_enabled": features_enabled
-    }
\ No newline at end of file
+    status = dict(_session_profile(api_key, now))
+    status["rate_limit"] = {
+        "limit": API_RATE_LIMIT,
+        "remaining": remaining,
+        "reset_at": datetime.fromtimestamp(reset_at).isoformat()
+    }
+    return status
@@ -0,0 +1,46 @@
+"""Per-request context shared by the API middleware, routes and logging."""
+
+import logging
+from contextvars import ContextVar
+
+# Request ID of the request currently being handled
+REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Log format; the request ID is filled in by RequestIdFilter
+LOG_FORMAT = "%(asctime)s - %(request_id)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Logging filter that stamps records with the current request ID."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Records replayed by a queue listener already carry the ID of the
+        # request that logged them
+        if not hasattr(record, "request_id"):
+            record.request_id = REQUEST_ID.get()
+        return True
+
+
+def add_request_id_filter(handler: logging.Handler) -> logging.Handler:
+    """Attach a RequestIdFilter to a handler unless it already has one.
+    
+    Args:
+        handler: Logging handler
+        
+    Returns:
+        The same handler
+    """
+    if not any(isinstance(f, RequestIdFilter) for f in handler.filters):
+        handler.addFilter(RequestIdFilter())
+    return handler
+
+
+def configure_logging(level: int = logging.INFO):
+    """Configure root logging with the request ID aware format.
+    
+    Args:
+        level: Root log level
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    for handler in logging.getLogger().handlers:
+        add_request_id_filter(handler)
@@ -7,29 +7,54 @@ import uvicorn
 from dotenv import load_dotenv
 
 from src.config import APP_PORT, LOG_LEVEL
+from frontend.api.context import configure_logging
 
 # Configure logging
 logging_level = getattr(logging, LOG_LEVEL, logging.INFO)
-logging.basicConfig(
-    level=logging_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging(logging_level)
 
 logger = logging.getLogger(__name__)
 
 
-def start_api_server(host="0.0.0.0", port=APP_PORT):
+def start_api_server(
+    host="0.0.0.0",
+    port=APP_PORT,
+    workers=1,
+    backlog=4096,
+    limit_concurrency=None,
+    limit_max_requests=None,
+    timeout_keep_alive=5
+):
     """Start the FastAPI server.
     
     Args:
         host: Host to bind to
         port: Port to bind to (defaults to APP_PORT from config)
+        workers: Number of worker processes
+        backlog: Maximum number of pending connections on the listening socket
+        limit_concurrency: Maximum concurrent connections per worker before
+            returning 503 (unlimited if None)
+        limit_max_requests: Requests served before a worker is restarted
+            (never if None)
+        timeout_keep_alive: Seconds to keep idle keep-alive connections open
     """
-    # Import the FastAPI app
-    from frontend.api.app import app
+    logger.info("Starting EXASPERATION API server on %s:%s with %d worker(s)", host, port, workers)
     
-    logger.info(f"Starting EXASPERATION API server on {host}:{port}")
-    uvicorn.run(app, host=host, port=port)
+    # The app is passed as an import string so uvicorn can spawn workers.
+    # log_config=None keeps the logging configuration set up above.
+    uvicorn.run(
+        "frontend.api.app:app",
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        backlog=backlog,
+        limit_concurrency=limit_concurrency,
+        limit_max_requests=limit_max_requests,
+        timeout_keep_alive=timeout_keep_alive,
+        log_config=None
+    )
 
 
 if __name__ == "__main__":
@@ -46,7 +71,45 @@ if __name__ == "__main__":
         default=APP_PORT, 
         help=f"API server port (default: {APP_PORT})"
     )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=1, 
+        help="Number of worker processes (set REDIS_URL to share rate limits across workers)"
+    )
+    parser.add_argument(
+        "--backlog", 
+        type=int, 
+        default=4096, 
+        help="Maximum number of pending connections (default: 4096)"
+    )
+    parser.add_argument(
+        "--limit-concurrency", 
+        type=int, 
+        default=None, 
+        help="Maximum concurrent connections per worker before returning 503"
+    )
+    parser.add_argument(
+        "--limit-max-requests", 
+        type=int, 
+        default=None, 
+        help="Restart a worker after serving this many requests"
+    )
+    parser.add_argument(
+        "--timeout-keep-alive", 
+        type=int, 
+        default=5, 
+        help="Seconds to keep idle keep-alive connections open (default: 5)"
+    )
     args = parser.parse_args()
     
     # Start API server
-    start_api_server(host=args.host, port=args.port)
\ No newline at end of file
+    start_api_server(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency,
+        limit_max_requests=args.limit_max_requests,
+        timeout_keep_alive=args.timeout_keep_alive
+    )
\ No newline at end of file
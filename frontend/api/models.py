@@ -1,13 +1,19 @@
 """Pydantic models for API requests and responses."""
 
-from typing import List, Dict, Any, Optional, Union
+from typing import Annotated, List, Dict, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+
+# Request models reject unknown fields; response models are read-only
+REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid")
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True)
 
 
 class SearchFilters(BaseModel):
     """Filters for search queries."""
     
+    model_config = REQUEST_MODEL_CONFIG
+    
     document_types: Optional[List[str]] = Field(None, description="Document type filters")
     vendors: Optional[List[str]] = Field(None, description="Vendor filters")
     products: Optional[List[str]] = Field(None, description="Product filters")
@@ -18,6 +24,8 @@ class SearchFilters(BaseModel):
 class SearchOptions(BaseModel):
     """Options for search queries."""
     
+    model_config = REQUEST_MODEL_CONFIG
+    
     max_results: Optional[int] = Field(10, description="Maximum number of results to return")
     include_metadata: Optional[bool] = Field(True, description="Whether to include document metadata")
     rerank: Optional[bool] = Field(True, description="Whether to rerank results")
@@ -27,6 +35,8 @@ class SearchOptions(BaseModel):
 class SearchRequest(BaseModel):
     """Search request model."""
     
+    model_config = REQUEST_MODEL_CONFIG
+    
     query: str = Field(..., description="Search query")
     filters: Optional[SearchFilters] = Field(None, description="Search filters")
     options: Optional[SearchOptions] = Field(None, description="Search options")
@@ -35,6 +45,8 @@ class SearchRequest(BaseModel):
 class DocumentMetadata(BaseModel):
     """Document metadata model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     document_type: Optional[str] = Field(None, description="Document type")
     vendor: Optional[str] = Field(None, description="Vendor")
     product: Optional[str] = Field(None, description="Product")
@@ -45,26 +57,23 @@ class DocumentMetadata(BaseModel):
 class SourceDocument(BaseModel):
     """Source document model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     id: str = Field(..., description="Document ID")
     title: str = Field(..., description="Document title")
     url: str = Field(..., description="Document URL")
-    # Allow chunk_id to be either string or int since the API is returning integers
-    chunk_id: Union[str, int] = Field(..., description="Chunk ID")
+    # Accept integer chunk IDs from the backend; coerced to str in pydantic-core
+    chunk_id: Annotated[str, BeforeValidator(str)] = Field(..., description="Chunk ID")
     content: str = Field(..., description="Document content")
     relevance_score: float = Field(..., description="Relevance score")
     metadata: DocumentMetadata = Field(..., description="Document metadata")
-    
-    # Model validators to ensure type consistency
-    @field_validator('chunk_id')
-    @classmethod
-    def convert_chunk_id_to_str(cls, v):
-        # Ensure chunk_id is always a string
-        return str(v)
 
 
 class SearchMetadata(BaseModel):
     """Metadata for search response."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
     filter_count: int = Field(..., description="Number of filters applied")
     total_matches: int = Field(..., description="Total number of matches")
@@ -74,6 +83,8 @@ class SearchMetadata(BaseModel):
 class SearchResponse(BaseModel):
     """Search response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     request_id: str = Field(..., description="Request ID")
     query: str = Field(..., description="Original query")
     answer: str = Field(..., description="Generated answer")
@@ -85,6 +96,8 @@ class SearchResponse(BaseModel):
 class SuggestionsResponse(BaseModel):
     """Suggestions response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     suggestions: List[str] = Field(..., description="Query suggestions")
     metadata: Dict[str, Any] = Field(..., description="Response metadata")
 
@@ -92,6 +105,8 @@ class SuggestionsResponse(BaseModel):
 class FeedbackRequest(BaseModel):
     """Feedback request model."""
     
+    model_config = REQUEST_MODEL_CONFIG
+    
     request_id: str = Field(..., description="Request ID")
     rating: str = Field(..., description="Rating (positive or negative)")
     comments: Optional[str] = Field(None, description="Feedback comments")
@@ -102,6 +117,8 @@ class FeedbackRequest(BaseModel):
 class FeedbackResponse(BaseModel):
     """Feedback response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     status: str = Field(..., description="Status")
     feedback_id: str = Field(..., description="Feedback ID")
     message: str = Field(..., description="Response message")
@@ -110,6 +127,8 @@ class FeedbackResponse(BaseModel):
 class MetadataOptionsResponse(BaseModel):
     """Metadata options response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     document_types: List[str] = Field(..., description="Available document types")
     vendors: List[str] = Field(..., description="Available vendors")
     products: Dict[str, List[str]] = Field(..., description="Available products by vendor")
@@ -120,6 +139,8 @@ class MetadataOptionsResponse(BaseModel):
 class RateLimit(BaseModel):
     """Rate limit information model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     limit: int = Field(..., description="Rate limit (requests per minute)")
     remaining: int = Field(..., description="Remaining requests")
     reset_at: str = Field(..., description="Time when the rate limit resets")
@@ -128,6 +149,8 @@ class RateLimit(BaseModel):
 class SessionStatusResponse(BaseModel):
     """Session status response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     authenticated: bool = Field(..., description="Whether the user is authenticated")
     user_id: str = Field(..., description="User ID")
     session_expires_at: str = Field(..., description="Session expiration time")
@@ -146,6 +169,8 @@ class ErrorDetail(BaseModel):
 class ErrorResponse(BaseModel):
     """Error response model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     error: Dict[str, Any] = Field(..., description="Error information")
     request_id: str = Field(..., description="Request ID")
 
@@ -0,0 +1,99 @@
+"""Near-duplicate query cache for search responses."""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """Cache of search responses looked up by query embedding similarity.
+    
+    Embeddings are kept L2-normalized in a preallocated matrix used as a
+    ring buffer, so a lookup is one matrix-vector product and the oldest
+    entry is overwritten once the cache is full. Each slot also records a
+    hash of its search parameters and when it was stored, so entries with
+    other filters or past their TTL are excluded before the best match is
+    picked.
+    """
+    
+    def __init__(self, capacity: int, threshold: float, ttl: float):
+        """Initialize the cache.
+        
+        Args:
+            capacity: Maximum number of cached responses
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds a cached response stays valid
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self._vectors: Optional[np.ndarray] = None  # Allocated on first add
+        self._params_hashes = np.zeros(capacity, dtype=np.int64)
+        self._stored_at = np.full(capacity, -np.inf)
+        self._entries: List[Optional[Tuple[bytes, Dict[str, Any]]]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, embedding: List[float], params_key: bytes) -> Optional[Dict[str, Any]]:
+        """Find the cached response of the most similar earlier query.
+        
+        Args:
+            embedding: Query embedding
+            params_key: Digest of the filters and options of the search
+            
+        Returns:
+            Cached response, or None if no fresh entry with the same
+            parameters is similar enough
+        """
+        size = self._size
+        if not size:
+            return None
+        
+        # Only entries with the same parameters that have not expired compete
+        eligible = (
+            (self._params_hashes[:size] == hash(params_key))
+            & (self._stored_at[:size] >= time.monotonic() - self.ttl)
+        )
+        if not eligible.any():
+            return None
+        
+        scores = np.where(eligible, self._vectors[:size] @ self._normalize(embedding), -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        
+        # Guard against a parameters hash collision
+        entry_params_key, response = self._entries[best]
+        if entry_params_key != params_key:
+            return None
+        return response
+    
+    def add(self, embedding: List[float], params_key: bytes, response: Dict[str, Any]):
+        """Cache a response under its query embedding.
+        
+        Args:
+            embedding: Query embedding
+            params_key: Digest of the filters and options of the search
+            response: Search response
+        """
+        vector = self._normalize(embedding)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+        
+        slot = self._next
+        self._vectors[slot] = vector
+        self._params_hashes[slot] = hash(params_key)
+        self._stored_at[slot] = time.monotonic()
+        self._entries[slot] = (params_key, response)
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def __len__(self) -> int:
+        return self._size
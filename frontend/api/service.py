@@ -1,12 +1,21 @@
 """Service layer for API endpoints."""
 
+import asyncio
 import logging
+import re
 import time
-import uuid
+import secrets
+import threading
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Mapping, NamedTuple, Optional, Tuple
 from datetime import datetime
+from types import MappingProxyType
 
+import orjson
+from cachetools import LRUCache, TTLCache
 from langchain.schema import Document
 
 from src.data_processing.vector_store import VectorDatabase
@@ -15,13 +24,36 @@ from src.retrieval.retriever import Retriever
 from src.retrieval.query_processor import QueryProcessor
 from src.retrieval.reranker import Reranker
 from src.data_processing.embeddings import MultiModalEmbeddingProvider
-from src.config import TOP_K_RETRIEVAL
+from src.config import TOP_K_RETRIEVAL, SEMANTIC_CACHE_THRESHOLD, API_STORAGE_DB_PATH
+from frontend.api.models import SearchFilters, SearchOptions
+from frontend.api.semantic_cache import SemanticAnswerCache
+from frontend.api.storage import BatchedSQLiteWriter
 
 logger = logging.getLogger(__name__)
 
-# In-memory storage for feedback and query history
-feedback_storage = {}
-query_history = {}
+# In-memory storage for feedback and query history. Entries are also
+# persisted to SQLite in the background, and expire from memory a day after
+# they were last written. storage_lock guards every mutation.
+STORAGE_TTL = 24 * 60 * 60
+feedback_storage = TTLCache(maxsize=100_000, ttl=STORAGE_TTL)
+query_history = TTLCache(maxsize=10_000, ttl=STORAGE_TTL)  # Maps user IDs to their most recent queries, newest first
+storage_lock = threading.RLock()
+
+# Number of queries kept in each user's history
+QUERY_HISTORY_SIZE = 100
+
+# Options applied when a search request does not include any
+DEFAULT_SEARCH_OPTIONS = SearchOptions()
+
+# Search responses are reused for identical queries for this long (seconds)
+ANSWER_CACHE_TTL = 600
+ANSWER_CACHE_SIZE = 1024
+
+# Number of query embeddings kept for near-duplicate query lookups
+SEMANTIC_CACHE_SIZE = 10_000
+
+# Number of recent query embeddings reused instead of calling the model
+EMBEDDING_CACHE_SIZE = 1024
 
 # List of common follow-up queries by topic to suggest to users
 COMMON_FOLLOWUPS = {
@@ -57,6 +89,267 @@ COMMON_FOLLOWUPS = {
     ]
 }
 
+# Hard-coded query suggestions by the first word of the query
+SUGGESTION_PREFIXES = {
+    "how": [
+        "How do I configure SAML authentication?",
+        "How do I create a custom parser?",
+        "How do I add a new data source?",
+        "How does the password reset detection rule work?",
+        "How can I optimize query performance?",
+        "How do I set up the Okta integration?",
+        "How does lateral movement detection work?",
+        "How do I troubleshoot data lake connectivity issues?"
+    ],
+    "what": [
+        "What are the components of a detection rule?",
+        "What is the parser validation process?",
+        "What detection capabilities exist for data exfiltration?",
+        "What are the supported data formats?",
+        "What are the security features in Exabeam?",
+        "What are the best practices for SSO implementation?",
+        "What events are generated during a password reset?"
+    ],
+    "where": [
+        "Where can I find documentation on data sources?",
+        "Where are detection rules stored?",
+        "Where should I look for audit logs?",
+        "Where can I configure authentication settings?"
+    ],
+    "can": [
+        "Can Exabeam integrate with Splunk?",
+        "Can I create custom dashboards?",
+        "Can detection rules be exported?",
+        "Can data be encrypted at rest?"
+    ]
+}
+
+# Default suggestions if nothing matches
+DEFAULT_SUGGESTIONS = [
+    "How does Exabeam detect threats?",
+    "What are the components of Advanced Analytics?",
+    "How do I create a custom parser?",
+    "What are the best practices for deploying Exabeam?",
+    "How can I optimize query performance?"
+]
+
+
+class SuggestionIndex(NamedTuple):
+    """A suggestion set prepared for prefix lookups."""
+    
+    suggestions: Tuple[str, ...]
+    pairs: Tuple[Tuple[str, str], ...]  # (lowercased, original) suggestions
+    keys: Tuple[str, ...]  # Lowercased suggestions, sorted
+    order: Tuple[int, ...]  # Position in suggestions of each key
+
+
+def _build_suggestion_index(suggestions: List[str]) -> SuggestionIndex:
+    """Build a prefix lookup index for a suggestion set.
+    
+    Args:
+        suggestions: Suggestions in the order they are returned
+        
+    Returns:
+        Suggestion index
+    """
+    pairs = tuple((suggestion.lower(), suggestion) for suggestion in suggestions)
+    entries = sorted((key, i) for i, (key, _) in enumerate(pairs))
+    return SuggestionIndex(
+        suggestions=tuple(suggestions),
+        pairs=pairs,
+        keys=tuple(key for key, _ in entries),
+        order=tuple(i for _, i in entries)
+    )
+
+
+SUGGESTION_INDEX = {word: _build_suggestion_index(suggestions) for word, suggestions in SUGGESTION_PREFIXES.items()}
+DEFAULT_SUGGESTION_INDEX = _build_suggestion_index(DEFAULT_SUGGESTIONS)
+
+# Search filter fields and the backend field and operator each maps to.
+# Fields sharing a backend field are merged, so created_after and
+# created_before together become one created_at range.
+FILTER_MAP: Tuple[Tuple[str, str, str], ...] = (
+    ("document_types", "doc_type", "$in"),
+    ("vendors", "vendor", "$in"),
+    ("products", "product", "$in"),
+    ("created_after", "created_at", "$gte"),
+    ("created_before", "created_at", "$lte")
+)
+
+# Fields shared by every search error response. The empty tuples are
+# serialized as empty lists and are never mutated.
+ERROR_RESPONSE_TEMPLATE = MappingProxyType({
+    "sources": (),
+    "suggested_queries": ()
+})
+ERROR_RESPONSE_METADATA = MappingProxyType({
+    "processing_time_ms": 0,
+    "filter_count": 0,
+    "total_matches": 0,
+    "threshold_applied": 0.0
+})
+
+# Random bytes for request and feedback IDs are drawn from the OS in blocks
+# of this size, so most IDs do not need a syscall
+ID_ENTROPY_BLOCK_SIZE = 4096
+ID_BYTES = 6
+_id_entropy = threading.local()
+
+
+def _new_id(prefix: str) -> str:
+    """Generate a random ID with 12 hex characters.
+    
+    Args:
+        prefix: ID prefix
+        
+    Returns:
+        ID of the form "<prefix>_<hex>"
+    """
+    offset = getattr(_id_entropy, "offset", ID_ENTROPY_BLOCK_SIZE)
+    if offset + ID_BYTES > ID_ENTROPY_BLOCK_SIZE:
+        _id_entropy.block = secrets.token_bytes(ID_ENTROPY_BLOCK_SIZE)
+        offset = 0
+    _id_entropy.offset = offset + ID_BYTES
+    return f"{prefix}_{_id_entropy.block[offset:offset + ID_BYTES].hex()}"
+
+
+# Second and ISO formatted local time of the last _iso_now() call
+_iso_now_cache = [0, ""]
+
+
+def _iso_now() -> str:
+    """Get the current local time as an ISO string, to whole seconds.
+    
+    The formatted string is reused until the second changes.
+    
+    Returns:
+        ISO formatted timestamp
+    """
+    now = int(time.time())
+    if now != _iso_now_cache[0]:
+        _iso_now_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _iso_now_cache[1]
+
+
+# Follow-ups returned for each category, and one from each of the main
+# categories when the query does not match any
+FOLLOWUPS_TOP3 = {category: tuple(queries[:3]) for category, queries in COMMON_FOLLOWUPS.items()}
+DEFAULT_FOLLOWUPS = (
+    COMMON_FOLLOWUPS["authentication"][0],
+    COMMON_FOLLOWUPS["detection rules"][0],
+    COMMON_FOLLOWUPS["data sources"][0]
+)
+
+# Available metadata filter values, from the API contract
+METADATA_OPTIONS = MappingProxyType({
+    "document_types": ("use_case", "parser", "rule", "data_source", "overview", "tutorial"),
+    "vendors": ("microsoft", "cisco", "okta", "palo_alto", "aws"),
+    "products": MappingProxyType({
+        "microsoft": ("active_directory", "azure_ad", "exchange_online", "windows"),
+        "cisco": ("asa", "firepower", "ise", "meraki"),
+        "okta": ("identity_cloud",)
+    }),
+    "use_cases": ("account_takeover", "data_exfiltration", "lateral_movement", "privilege_escalation"),
+    "date_range": MappingProxyType({
+        "oldest": "2022-01-15",
+        "newest": "2025-03-27"
+    })
+})
+
+# Keywords that place a query in a follow-up category, in priority order
+CATEGORY_KEYWORDS = {
+    "authentication": ["login", "sso", "saml", "oauth", "mfa", "authenticate"],
+    "detection rules": ["rule", "detection", "alert", "trigger", "correlation"],
+    "data sources": ["source", "ingest", "data", "format", "input"],
+    "parsers": ["parse", "parser", "extract", "field", "normalize"],
+    "security": ["secure", "threat", "attack", "lateral", "exfiltration"]
+}
+
+# One compiled alternation per category, so classifying a query is a few
+# C-level scans instead of a Python substring test per keyword
+CATEGORY_PATTERNS = tuple(
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+)
+
+
+def _history_column() -> deque:
+    return deque(maxlen=QUERY_HISTORY_SIZE)
+
+
+@dataclass(slots=True)
+class UserHistory:
+    """A user's most recent queries, newest first, stored column by column."""
+    
+    request_ids: deque = field(default_factory=_history_column)
+    queries: deque = field(default_factory=_history_column)
+    timestamps_ns: deque = field(default_factory=_history_column)  # time.time_ns() of each query
+    doc_counts: deque = field(default_factory=_history_column)
+    
+    def add(self, request_id: str, query: str, timestamp_ns: int, doc_count: int):
+        """Add a query as the newest entry, dropping the oldest once full.
+        
+        Args:
+            request_id: Request ID
+            query: Query string
+            timestamp_ns: Time of the query in nanoseconds since the epoch
+            doc_count: Number of documents retrieved
+        """
+        self.request_ids.appendleft(request_id)
+        self.queries.appendleft(query)
+        self.timestamps_ns.appendleft(timestamp_ns)
+        self.doc_counts.appendleft(doc_count)
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        """Get the history as entry dicts, newest first.
+        
+        Returns:
+            List of history entries with ISO formatted timestamps
+        """
+        return [
+            {
+                "request_id": request_id,
+                "query": query,
+                "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(),
+                "doc_count": doc_count
+            }
+            for request_id, query, timestamp_ns, doc_count in zip(
+                self.request_ids, self.queries, self.timestamps_ns, self.doc_counts
+            )
+        ]
+    
+    def __len__(self) -> int:
+        return len(self.queries)
+
+
+def _make_source(i: int, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the source document entry of a search response.
+    
+    Args:
+        i: Rank of the document in the results
+        doc: Document returned by the query engine
+        
+    Returns:
+        Source document entry
+    """
+    metadata = doc.get("metadata", {})
+    get = metadata.get
+    return {
+        "id": get("doc_id", f"doc_{i}"),
+        "title": get("title", "Untitled Document"),
+        "url": metadata["url"] if "url" in metadata else get("source", "#"),
+        "chunk_id": get("chunk_id", f"chunk_{i}"),
+        "content": doc.get("content", ""),
+        "relevance_score": 1.0 - (i * 0.05),  # Simple decreasing score
+        "metadata": {
+            "document_type": get("doc_type", "unknown"),
+            "vendor": get("vendor", ""),
+            "product": get("product", ""),
+            "created_at": get("created_at", ""),
+            "updated_at": get("updated_at", "")
+        }
+    }
+
 
 class ExasperationService:
     """Service class for EXASPERATION API endpoints."""
@@ -69,6 +362,27 @@ class ExasperationService:
         """
         self.query_engine = query_engine
         
+        # Set once warmup() has opened the backend connections
+        self.ready = False
+        
+        # Exact-match cache of search responses and its hit/miss counts
+        self._answer_cache = TTLCache(maxsize=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL)
+        self._answer_cache_stats = {"hits": 0, "misses": 0, "semantic_hits": 0}
+        
+        # Near-duplicate queries are matched by embedding similarity
+        self._semantic_cache = SemanticAnswerCache(
+            capacity=SEMANTIC_CACHE_SIZE,
+            threshold=SEMANTIC_CACHE_THRESHOLD,
+            ttl=ANSWER_CACHE_TTL
+        )
+        
+        # Writes feedback and query history to disk off the request path
+        self._storage_writer = BatchedSQLiteWriter(API_STORAGE_DB_PATH)
+        
+        # Recent embeddings by processed query. Filled from worker threads.
+        self._embedding_cache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+        self._embedding_cache_lock = threading.Lock()
+        
         if not self.query_engine:
             # Initialize dependencies for query engine
             logger.info("Initializing new query engine")
@@ -113,26 +427,51 @@ class ExasperationService:
         # Initialize query engine
         self.query_engine = QueryEngine(retriever=retriever)
     
+    async def warmup(self):
+        """Open backend connections before the first request is served.
+        
+        Runs a one-result similarity search, which loads the embedding model
+        and opens the vector store connection, so the first search does not
+        pay for them.
+        """
+        if not self.query_engine:
+            return
+        
+        start_time = time.time()
+        try:
+            vector_db = self.query_engine.retriever.vector_db
+            await asyncio.to_thread(vector_db.similarity_search, "warmup", k=1)
+        except Exception as e:
+            logger.warning("Service warmup failed: %s", e)
+            return
+        
+        self.ready = True
+        logger.info("Service warmed up in %dms", int((time.time() - start_time) * 1000))
+    
+    async def close(self):
+        """Write out pending feedback and query history."""
+        await self._storage_writer.close()
+    
     async def process_search_query(
         self,
         query: str,
-        filters: Optional[Dict[str, Any]] = None,
-        options: Optional[Dict[str, Any]] = None,
+        filters: Optional[SearchFilters] = None,
+        options: Optional[SearchOptions] = None,
         user_id: str = "anonymous"
     ) -> Dict[str, Any]:
         """Process a search query.
         
         Args:
             query: User query
-            filters: Optional metadata filters
-            options: Optional search options
+            filters: Optional metadata filters model
+            options: Optional search options model
             user_id: User ID for logging
             
         Returns:
             Search response
         """
         start_time = time.time()
-        request_id = f"req_{uuid.uuid4().hex[:12]}"
+        request_id = _new_id("req")
         logger.info(f"Processing search query: '{query}' (request_id: {request_id})")
         
         if not self.query_engine:
@@ -145,34 +484,56 @@ class ExasperationService:
             )
         
         # Default options
-        options = options or {}
-        max_results = options.get("max_results", 10)
-        include_metadata = options.get("include_metadata", True)
-        rerank = options.get("rerank", True)
-        threshold = options.get("threshold", 0.7)
+        options = options or DEFAULT_SEARCH_OPTIONS
+        max_results = options.max_results
+        include_metadata = options.include_metadata
+        rerank = options.rerank
+        threshold = options.threshold
         
         # Convert filters to backend format if present
         backend_filters = None
         if filters:
             backend_filters = {}
-            if filters.get("document_types"):
-                backend_filters["doc_type"] = {"$in": filters["document_types"]}
-            if filters.get("vendors"):
-                backend_filters["vendor"] = {"$in": filters["vendors"]}
-            if filters.get("products"):
-                backend_filters["product"] = {"$in": filters["products"]}
-            if filters.get("created_after"):
-                backend_filters["created_at"] = {"$gte": filters["created_after"]}
-            if filters.get("created_before"):
-                backend_filters["created_at"] = {"$lte": filters["created_before"]}
-        
-        # Process query with query engine
+            for filter_field, backend_field, operator in FILTER_MAP:
+                value = getattr(filters, filter_field)
+                if value:
+                    backend_filters.setdefault(backend_field, {})[operator] = value
+            backend_filters = backend_filters or None
+        
+        # Serve repeated queries from the answer cache
+        params_key = self._search_params_key(backend_filters, max_results, threshold)
+        cache_key = self._answer_cache_key(query, params_key)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            self._answer_cache_stats["hits"] += 1
+            logger.info("Answer cache hit for query: '%s'", query)
+            return self._cached_response(cached, request_id, query, user_id)
+        
+        # Then from an earlier query that means the same thing
+        query_embedding = None
+        try:
+            query_embedding = await asyncio.to_thread(self._embed_query, query)
+            cached = self._semantic_cache.get(query_embedding, params_key)
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            cached = None
+        if cached is not None:
+            self._answer_cache_stats["semantic_hits"] += 1
+            self._answer_cache[cache_key] = cached
+            logger.info("Semantic cache hit for query: '%s'", query)
+            return self._cached_response(cached, request_id, query, user_id)
+        self._answer_cache_stats["misses"] += 1
+        
+        # Process query with query engine. Retrieval and generation block, so
+        # run them in a worker thread to keep serving other requests.
         try:
-            result = self.query_engine.process_query(
+            result = await asyncio.to_thread(
+                self.query_engine.process_query,
                 query=query,
                 filter=backend_filters,
                 temperature=0.2,  # Low temperature for accuracy
-                use_cache=True
+                use_cache=True,
+                query_embedding=query_embedding
             )
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}")
@@ -196,28 +557,7 @@ class ExasperationService:
         processing_time_ms = int((time.time() - start_time) * 1000)
         
         # Format response
-        sources = []
-        for i, doc in enumerate(documents):
-            # Extract metadata
-            metadata = doc.get("metadata", {})
-            
-            # Create source document entry
-            source = {
-                "id": metadata.get("doc_id", f"doc_{i}"),
-                "title": metadata.get("title", "Untitled Document"),
-                "url": metadata.get("url", metadata.get("source", "#")),
-                "chunk_id": metadata.get("chunk_id", f"chunk_{i}"),
-                "content": doc.get("content", ""),
-                "relevance_score": 1.0 - (i * 0.05),  # Simple decreasing score
-                "metadata": {
-                    "document_type": metadata.get("doc_type", "unknown"),
-                    "vendor": metadata.get("vendor", ""),
-                    "product": metadata.get("product", ""),
-                    "created_at": metadata.get("created_at", ""),
-                    "updated_at": metadata.get("updated_at", "")
-                }
-            }
-            sources.append(source)
+        sources = [_make_source(i, doc) for i, doc in enumerate(documents)]
         
         # Create response
         response = {
@@ -234,8 +574,106 @@ class ExasperationService:
             }
         }
         
+        self._answer_cache[cache_key] = response
+        if query_embedding is not None:
+            self._semantic_cache.add(query_embedding, params_key, response)
+        
         logger.info(f"Query processed in {processing_time_ms}ms: '{query}'")
         return response
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query the same way the retriever does.
+        
+        The retriever embeds the processed query, so the result can be passed
+        to the query engine and the query is only embedded once per search.
+        
+        Args:
+            query: User query
+            
+        Returns:
+            Embedding of the processed query
+        """
+        query_processor = self.query_engine.retriever.query_processor
+        processed_query = query_processor.process_query(query)
+        
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(processed_query)
+        if embedding is None:
+            embedding = query_processor.embed_query(processed_query)
+            with self._embedding_cache_lock:
+                self._embedding_cache[processed_query] = embedding
+        return embedding
+    
+    def _search_params_key(
+        self,
+        backend_filters: Optional[Dict[str, Any]],
+        max_results: int,
+        threshold: float
+    ) -> bytes:
+        """Build a digest of the search parameters that shape a response.
+        
+        Args:
+            backend_filters: Filters in backend format
+            max_results: Maximum number of results
+            threshold: Relevance threshold
+            
+        Returns:
+            Digest of the canonical JSON of the parameters
+        """
+        params = orjson.dumps([backend_filters, max_results, threshold], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(params, digest_size=16).digest()
+    
+    def _answer_cache_key(self, query: str, params_key: bytes) -> bytes:
+        """Build the exact-match answer cache key for a search.
+        
+        Args:
+            query: User query
+            params_key: Digest of the search parameters
+            
+        Returns:
+            Digest of the normalized query and search parameters
+        """
+        return hashlib.blake2b(query.strip().lower().encode() + params_key, digest_size=16).digest()
+    
+    def _cached_response(
+        self,
+        cached: Dict[str, Any],
+        request_id: str,
+        query: str,
+        user_id: str
+    ) -> Dict[str, Any]:
+        """Build the response for a search served from cache.
+        
+        Args:
+            cached: Cached response
+            request_id: Request ID of this search
+            query: Query of this search
+            user_id: User ID for the query history
+            
+        Returns:
+            Copy of the cached response with per-request fields replaced
+        """
+        self._save_to_query_history(user_id, request_id, query, cached["sources"])
+        response = dict(cached, request_id=request_id, query=query)
+        response["metadata"] = dict(cached["metadata"], processing_time_ms=0)
+        return response
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get answer cache statistics.
+        
+        Returns:
+            Hit and miss counts, hit rate and current sizes of the answer caches
+        """
+        hits = self._answer_cache_stats["hits"] + self._answer_cache_stats["semantic_hits"]
+        misses = self._answer_cache_stats["misses"]
+        return {
+            "hits": self._answer_cache_stats["hits"],
+            "semantic_hits": self._answer_cache_stats["semantic_hits"],
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "size": len(self._answer_cache),
+            "semantic_size": len(self._semantic_cache)
+        }
 
     def _create_error_response(
         self,
@@ -259,13 +697,9 @@ class ExasperationService:
             "request_id": request_id,
             "query": query,
             "answer": f"Error: {error_message}",
-            "sources": [],
-            "suggested_queries": [],
+            **ERROR_RESPONSE_TEMPLATE,
             "metadata": {
-                "processing_time_ms": 0,
-                "filter_count": 0,
-                "total_matches": 0,
-                "threshold_applied": 0.0,
+                **ERROR_RESPONSE_METADATA,
                 "error": {
                     "code": error_code,
                     "message": error_message
@@ -287,32 +721,14 @@ class ExasperationService:
         query_lower = query.lower()
         
         # Check for keywords to identify category
-        category = None
-        if any(word in query_lower for word in ["login", "sso", "saml", "oauth", "mfa", "authenticate"]):
-            category = "authentication"
-        elif any(word in query_lower for word in ["rule", "detection", "alert", "trigger", "correlation"]):
-            category = "detection rules"
-        elif any(word in query_lower for word in ["source", "ingest", "data", "format", "input"]):
-            category = "data sources"
-        elif any(word in query_lower for word in ["parse", "parser", "extract", "field", "normalize"]):
-            category = "parsers"
-        elif any(word in query_lower for word in ["secure", "threat", "attack", "lateral", "exfiltration"]):
-            category = "security"
-        
-        # Get suggestions for category or default to empty list
-        suggestions = COMMON_FOLLOWUPS.get(category, [])
-        
-        # If we couldn't identify a category, pick some general suggestions
-        if not suggestions:
-            # Pick one from each category as a generic set
-            suggestions = [
-                COMMON_FOLLOWUPS["authentication"][0],
-                COMMON_FOLLOWUPS["detection rules"][0],
-                COMMON_FOLLOWUPS["data sources"][0]
-            ]
+        category = next(
+            (category for category, pattern in CATEGORY_PATTERNS if pattern.search(query_lower)),
+            None
+        )
         
-        # Return up to 3 suggestions
-        return suggestions[:3]
+        # Return up to 3 suggestions for the category, or a generic set if we
+        # couldn't identify one
+        return list(FOLLOWUPS_TOP3.get(category, DEFAULT_FOLLOWUPS))
     
     def _save_to_query_history(
         self,
@@ -329,24 +745,19 @@ class ExasperationService:
             query: Query string
             documents: Retrieved documents
         """
-        # Initialize user history if not exists
-        if user_id not in query_history:
-            query_history[user_id] = []
-        
-        # Create history entry
-        history_entry = {
-            "request_id": request_id,
-            "query": query,
-            "timestamp": datetime.now().isoformat(),
-            "doc_count": len(documents)
-        }
-        
-        # Add to history (newest first)
-        query_history[user_id].insert(0, history_entry)
-        
-        # Limit history size
-        if len(query_history[user_id]) > 100:
-            query_history[user_id] = query_history[user_id][:100]
+        # Add to history (newest first); the oldest entry drops off once the
+        # history is full
+        with storage_lock:
+            history = query_history.get(user_id)
+            if history is None:
+                history = UserHistory()
+            history.add(request_id, query, time.time_ns(), len(documents))
+            # Reassign so the history expires a day after the latest query
+            query_history[user_id] = history
+        self._storage_writer.submit(
+            "query_history",
+            (request_id, user_id, query, _iso_now(), len(documents))
+        )
     
     async def get_query_suggestions(
         self,
@@ -367,75 +778,51 @@ class ExasperationService:
         # Simple implementation - in a real system, this would use a proper suggestion engine
         # or be based on frequent queries in the system
         
-        # Hard-coded suggestions by prefix
-        suggestion_prefixes = {
-            "how": [
-                "How do I configure SAML authentication?",
-                "How do I create a custom parser?",
-                "How do I add a new data source?",
-                "How does the password reset detection rule work?",
-                "How can I optimize query performance?",
-                "How do I set up the Okta integration?",
-                "How does lateral movement detection work?",
-                "How do I troubleshoot data lake connectivity issues?"
-            ],
-            "what": [
-                "What are the components of a detection rule?",
-                "What is the parser validation process?",
-                "What detection capabilities exist for data exfiltration?",
-                "What are the supported data formats?",
-                "What are the security features in Exabeam?",
-                "What are the best practices for SSO implementation?",
-                "What events are generated during a password reset?"
-            ],
-            "where": [
-                "Where can I find documentation on data sources?",
-                "Where are detection rules stored?",
-                "Where should I look for audit logs?",
-                "Where can I configure authentication settings?"
-            ],
-            "can": [
-                "Can Exabeam integrate with Splunk?",
-                "Can I create custom dashboards?",
-                "Can detection rules be exported?",
-                "Can data be encrypted at rest?"
-            ]
-        }
+        query_lower = partial_query.lower()
         
-        # Default suggestions if nothing matches
-        default_suggestions = [
-            "How does Exabeam detect threats?",
-            "What are the components of Advanced Analytics?",
-            "How do I create a custom parser?",
-            "What are the best practices for deploying Exabeam?",
-            "How can I optimize query performance?"
-        ]
+        # Pick the suggestion set for the first word of the query
+        first_word = query_lower.lstrip().partition(" ")[0]
+        index = SUGGESTION_INDEX.get(first_word, DEFAULT_SUGGESTION_INDEX)
         
-        # Get first word of query to match against prefixes
-        first_word = partial_query.split()[0].lower() if partial_query else ""
+        if not query_lower:
+            return list(index.suggestions[:limit])
         
-        # Get suggestions based on prefix
-        all_suggestions = suggestion_prefixes.get(first_word, default_suggestions)
+        # Suggestions starting with the query form one range of the sorted keys
+        start = bisect_left(index.keys, query_lower)
+        end = bisect_left(index.keys, query_lower + "\U0010ffff", start)
+        matching_suggestions = [index.suggestions[i] for i in sorted(index.order[start:end])]
         
-        # Filter based on partial query
-        if partial_query:
+        # If no exact matches, try contains
+        if not matching_suggestions:
             matching_suggestions = [
-                s for s in all_suggestions 
-                if s.lower().startswith(partial_query.lower())
+                suggestion for suggestion_lower, suggestion in index.pairs
+                if query_lower in suggestion_lower
             ]
-            
-            # If no exact matches, try contains
-            if not matching_suggestions:
-                matching_suggestions = [
-                    s for s in all_suggestions 
-                    if partial_query.lower() in s.lower()
-                ]
-        else:
-            matching_suggestions = all_suggestions
         
         # Return limited results
         return matching_suggestions[:limit]
     
+    async def get_query_suggestions_batch(
+        self,
+        requests: List[Tuple[str, int]]
+    ) -> List[List[str]]:
+        """Get query suggestions for a batch of partial queries.
+        
+        Duplicate (partial_query, limit) pairs in the batch are only
+        computed once.
+        
+        Args:
+            requests: List of (partial_query, limit) pairs
+            
+        Returns:
+            List of suggestion lists, in the same order as requests
+        """
+        results = {}
+        for partial_query, limit in requests:
+            if (partial_query, limit) not in results:
+                results[(partial_query, limit)] = await self.get_query_suggestions(partial_query, limit)
+        return [results[request] for request in requests]
+    
     async def submit_feedback(
         self,
         request_id: str,
@@ -461,7 +848,7 @@ class ExasperationService:
         logger.info(f"Submitting feedback for request {request_id}: {rating}")
         
         # Generate feedback ID
-        feedback_id = f"fb_{uuid.uuid4().hex[:12]}"
+        feedback_id = _new_id("fb")
         
         # Create feedback entry
         feedback_entry = {
@@ -472,11 +859,22 @@ class ExasperationService:
             "comments": comments,
             "selected_sources": selected_sources,
             "user_query_reformulation": user_query_reformulation,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
         
         # Store feedback
-        feedback_storage[feedback_id] = feedback_entry
+        with storage_lock:
+            feedback_storage[feedback_id] = feedback_entry
+        self._storage_writer.submit("feedback", (
+            feedback_id,
+            request_id,
+            user_id,
+            rating,
+            comments,
+            orjson.dumps(selected_sources).decode() if selected_sources is not None else None,
+            user_query_reformulation,
+            feedback_entry["timestamp"]
+        ))
         
         # Return response
         return {
@@ -485,58 +883,14 @@ class ExasperationService:
             "message": "Thank you for your feedback!"
         }
     
-    async def get_metadata_options(self) -> Dict[str, Any]:
+    async def get_metadata_options(self) -> Mapping[str, Any]:
         """Get available metadata options for filtering.
         
         Returns:
-            Metadata options
+            Read-only metadata options
         """
         logger.info("Getting metadata options")
         
         # In a real implementation, this would query the database
         # For now, return hardcoded values from the API contract
-        
-        return {
-            "document_types": [
-                "use_case",
-                "parser",
-                "rule",
-                "data_source",
-                "overview",
-                "tutorial"
-            ],
-            "vendors": [
-                "microsoft",
-                "cisco",
-                "okta",
-                "palo_alto",
-                "aws"
-            ],
-            "products": {
-                "microsoft": [
-                    "active_directory",
-                    "azure_ad",
-                    "exchange_online",
-                    "windows"
-                ],
-                "cisco": [
-                    "asa",
-                    "firepower",
-                    "ise",
-                    "meraki"
-                ],
-                "okta": [
-                    "identity_cloud"
-                ]
-            },
-            "use_cases": [
-                "account_takeover",
-                "data_exfiltration",
-                "lateral_movement",
-                "privilege_escalation"
-            ],
-            "date_range": {
-                "oldest": "2022-01-15",
-                "newest": "2025-03-27"
-            }
-        }
\ No newline at end of file
+        return METADATA_OPTIONS
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""Persistent storage for feedback and query history."""
+
+import asyncio
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Table definitions and the insert statement for each table
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS feedback (
+        feedback_id TEXT PRIMARY KEY,
+        request_id TEXT,
+        user_id TEXT,
+        rating TEXT,
+        comments TEXT,
+        selected_sources TEXT,
+        user_query_reformulation TEXT,
+        timestamp TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS query_history (
+        request_id TEXT,
+        user_id TEXT,
+        query TEXT,
+        timestamp TEXT,
+        doc_count INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS query_history_user ON query_history (user_id)"
+)
+INSERT_STATEMENTS = {
+    "feedback": "INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "query_history": "INSERT INTO query_history VALUES (?, ?, ?, ?, ?)"
+}
+
+
+class BatchedSQLiteWriter:
+    """Writes rows to SQLite from a background task in batches.
+    
+    Callers only enqueue rows, so request handlers never wait on disk. The
+    background task collects rows for up to `interval` seconds or
+    `batch_size` rows and writes them with one executemany per table in a
+    worker thread.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 500,
+        interval: float = 0.1,
+        maxsize: int = 10000
+    ):
+        """Initialize the writer.
+        
+        Args:
+            db_path: Path of the SQLite database
+            batch_size: Maximum number of rows written at once
+            interval: Seconds to wait for more rows before writing
+            maxsize: Maximum number of pending rows
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.maxsize = maxsize
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def submit(self, table: str, row: Tuple):
+        """Queue a row for writing.
+        
+        Rows are dropped with a warning when the queue is full.
+        
+        Args:
+            table: Table name (key of INSERT_STATEMENTS)
+            row: Column values
+        """
+        # Start the background writer on first use (per worker process)
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._task = asyncio.create_task(self._run())
+        
+        try:
+            self._queue.put_nowait((table, row))
+        except asyncio.QueueFull:
+            logger.warning("Storage queue full, dropping %s row", table)
+    
+    async def close(self):
+        """Write all queued rows and stop the background writer."""
+        if self._task is None or self._task.done():
+            return
+        await self._queue.put(None)
+        await self._task
+    
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+    
+    def _write(self, batch: List[Tuple[str, Tuple]]):
+        if self._conn is None:
+            self._conn = self._connect()
+        
+        rows_by_table: Dict[str, List[Tuple]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+        
+        with self._conn:
+            for table, rows in rows_by_table.items():
+                self._conn.executemany(INSERT_STATEMENTS[table], rows)
+    
+    async def _run(self):
+        """Write queued rows in batches until closed."""
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            # Collect more rows until the batch is full or the interval ends
+            batch = [item]
+            deadline = loop.time() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            
+            # The connection is only used from here, one batch at a time
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                logger.error("Failed to write %d rows to %s: %s", len(batch), self.db_path, e)
+        
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -7,9 +7,11 @@ This script demonstrates how to use the EXASPERATION API endpoints.
 import os
 import sys
 import time
-import json
 import argparse
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
@@ -20,6 +22,16 @@ load_dotenv()
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8080/v1")
 API_KEY = os.getenv("EXASPERATION_API_KEY", "test_key_1234567890")
 
+# Shared session so every call reuses pooled connections
+SESSION = requests.Session()
+for prefix in ("http://", "https://"):
+    SESSION.mount(prefix, HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.1)
+    ))
+SESSION.headers.update({"Authorization": f"Bearer {API_KEY}"})
+
 
 def print_response(response: requests.Response, title: str):
     """Print formatted API response.
@@ -39,7 +51,7 @@ def print_response(response: requests.Response, title: str):
     print("\nResponse:")
     if response.status_code == 200:
         # Format JSON response
-        formatted_json = json.dumps(response.json(), indent=2)
+        formatted_json = orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()
         print(formatted_json)
     else:
         # Print error response
@@ -77,12 +89,7 @@ def search_query(query: str, filters: Optional[Dict[str, Any]] = None):
         payload["filters"] = filters
     
     # Make request
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.post(url, headers=headers, json=payload)
+    response = SESSION.post(url, json=payload)
     print_response(response, "Search Query")
 
 
@@ -93,14 +100,10 @@ def get_suggestions(partial_query: str, limit: int = 5):
         partial_query: Partial query
         limit: Maximum number of suggestions
     """
-    url = f"{API_BASE_URL}/suggestions?partial_query={partial_query}&limit={limit}"
+    url = f"{API_BASE_URL}/suggestions"
     
     # Make request
-    headers = {
-        "Authorization": f"Bearer {API_KEY}"
-    }
-    
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url, params={"partial_query": partial_query, "limit": limit})
     print_response(response, "Query Suggestions")
 
 
@@ -125,12 +128,7 @@ def submit_feedback(request_id: str, rating: str, comments: Optional[str] = None
         payload["comments"] = comments
     
     # Make request
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.post(url, headers=headers, json=payload)
+    response = SESSION.post(url, json=payload)
     print_response(response, "Submit Feedback")
 
 
@@ -139,11 +137,7 @@ def get_metadata_options():
     url = f"{API_BASE_URL}/metadata/options"
     
     # Make request
-    headers = {
-        "Authorization": f"Bearer {API_KEY}"
-    }
-    
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url)
     print_response(response, "Metadata Options")
 
 
@@ -152,16 +146,14 @@ def get_session_status():
     url = f"{API_BASE_URL}/session/status"
     
     # Make request
-    headers = {
-        "Authorization": f"Bearer {API_KEY}"
-    }
-    
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url)
     print_response(response, "Session Status")
 
 
 def main():
     """Main function."""
+    global API_BASE_URL, API_KEY
+    
     parser = argparse.ArgumentParser(description="EXASPERATION API Test Client")
     parser.add_argument(
         "--api-url", 
@@ -185,9 +177,9 @@ def main():
     args = parser.parse_args()
     
     # Update global variables
-    global API_BASE_URL, API_KEY
     API_BASE_URL = args.api_url
     API_KEY = args.api_key
+    SESSION.headers["Authorization"] = f"Bearer {API_KEY}"
     
     # Print API information
     print(f"Using API URL: {API_BASE_URL}")
@@ -1,7 +1,24 @@
 """Main Streamlit application for Exabomination."""
 
+import atexit
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Dict, Any, Optional, Union
+from urllib.parse import urlparse
+
+import httpx
+import orjson
 import streamlit as st
-from typing import Dict, Any
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # Import components
 from frontend.components.search_interface import search_interface, query_history_sidebar
@@ -10,10 +27,21 @@ from frontend.components.filters_panel import filters_panel
 
 # Import API client
 from frontend.utils.api_client import api_client
-from frontend.api.models import SearchFilters, SearchOptions, ErrorResponse
+from frontend.api.models import (
+    DocumentMetadata,
+    ErrorResponse,
+    MetadataOptionsResponse,
+    SearchFilters,
+    SearchMetadata,
+    SearchOptions,
+    SearchRequest,
+    SearchResponse,
+    SourceDocument
+)
 
 # Import configuration
 from frontend.config import (
+    DEBUG,
     DEFAULT_MAX_RESULTS,
     DEFAULT_THRESHOLD,
     DEFAULT_INCLUDE_METADATA,
@@ -21,6 +49,30 @@ from frontend.config import (
     THEME_PRIMARY_COLOR
 )
 
+# Custom CSS, built once from the theme color
+CUSTOM_CSS = f"""
+<style>
+    .stApp {{color: #333333;}}
+    .stButton button {{background-color: {THEME_PRIMARY_COLOR}; color: white;}}
+    a {{color: {THEME_PRIMARY_COLOR};}}
+    .stProgress .st-bo {{background-color: {THEME_PRIMARY_COLOR};}}
+</style>
+"""
+
+# API URL as set in the environment (.env.frontend is loaded by frontend.config)
+ENV_API_URL = os.getenv("EXABOMINATION_API_URL", "Not set")
+
+# Search endpoint of the configured API
+SEARCH_URL = f"{api_client.base_url}/search"
+
+# Shared HTTP client so searches, metadata lookups and probes reuse pooled
+# keep-alive connections instead of opening a new connection per call
+_HTTP = httpx.Client(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+atexit.register(_HTTP.close)
+
 # Set page config
 st.set_page_config(
     page_title="Exabomination - Exabeam Documentation Search",
@@ -30,14 +82,7 @@ st.set_page_config(
 )
 
 # Apply custom CSS
-st.markdown(f"""
-<style>
-    .stApp {{color: #333333;}}
-    .stButton button {{background-color: {THEME_PRIMARY_COLOR}; color: white;}}
-    a {{color: {THEME_PRIMARY_COLOR};}}
-    .stProgress .st-bo {{background-color: {THEME_PRIMARY_COLOR};}}
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 def init_session_state():
@@ -56,47 +101,171 @@ def init_session_state():
 # Initialize session state
 init_session_state()
 
-# Define a cached search function outside of any class
+# Read size when streaming search responses
+SEARCH_RESPONSE_CHUNK_SIZE = 65536
+
+def _cache_key(model) -> tuple:
+    """Build a small hashable cache key from the set fields of a model.
+    
+    Args:
+        model: Pydantic model or None
+        
+    Returns:
+        Sorted tuple of (field, value) pairs
+    """
+    if model is None:
+        return ()
+    return tuple(sorted(model.model_dump(exclude_none=True).items()))
+
+# Search options are fixed by the frontend config, so build them and their
+# cache key once
+DEFAULT_SEARCH_OPTIONS = SearchOptions(
+    max_results=DEFAULT_MAX_RESULTS,
+    include_metadata=DEFAULT_INCLUDE_METADATA,
+    rerank=DEFAULT_RERANK,
+    threshold=DEFAULT_THRESHOLD
+)
+DEFAULT_OPTIONS_KEY = _cache_key(DEFAULT_SEARCH_OPTIONS)
+
+# Define a cached search function outside of any class. Streamlit does not
+# hash arguments starting with an underscore, so only the keys are hashed.
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def cached_search(query: str, filters_json: str, options_json: str, api_url: str, headers_dict: Dict):
+def cached_search(
+    query: str,
+    filters_key: tuple,
+    options_key: tuple,
+    api_url: str,
+    _body_json: str
+) -> Dict[str, Any]:
     """Perform search with caching.
     
     Args:
         query: Search query
-        filters_json: JSON string of filters
-        options_json: JSON string of options
+        filters_key: Cache key of the filters (see _cache_key)
+        options_key: Cache key of the options (see _cache_key)
         api_url: API URL
-        headers_dict: Headers dictionary
+        _body_json: Serialized SearchRequest to send on a cache miss
         
     Returns:
-        Search response or error
+        Dictionary with "ok" (whether the search succeeded) and "body" (the
+        response JSON), kept as plain data so the cache stores it cheaply
+        
+    Raises:
+        httpx.RequestError: If the API cannot be reached (not cached)
     """
-    try:
-        # Parse JSON strings back to objects if provided
-        filters = None if not filters_json else SearchFilters.model_validate_json(filters_json)
-        options = None if not options_json else SearchOptions.model_validate_json(options_json)
+    # Make API call, streaming the body straight into bytes for orjson
+    with _HTTP.stream(
+        "POST",
+        api_url,
+        headers=api_client.headers,
+        content=_body_json
+    ) as response:
+        raw = b"".join(response.iter_bytes(SEARCH_RESPONSE_CHUNK_SIZE))
+        return {"ok": response.status_code == 200, "body": orjson.loads(raw)}
+
+def _search_body(query: str, filters: Optional[SearchFilters]) -> str:
+    """Serialize a search request with the default options.
+    
+    Args:
+        query: The search query
+        filters: Search filters
         
-        # Create request
-        search_request = SearchRequest(
-            query=query,
-            filters=filters,
-            options=options
+    Returns:
+        JSON body of the SearchRequest
+    """
+    return SearchRequest(
+        query=query,
+        filters=filters,
+        options=DEFAULT_SEARCH_OPTIONS
+    ).model_dump_json()
+
+def _mock_search_response(query: str, filters: Optional[SearchFilters]) -> SearchResponse:
+    """Build a mock search response for development mode.
+    
+    Args:
+        query: The search query
+        filters: Search filters
+        
+    Returns:
+        Mock search response
+    """
+    return SearchResponse(
+        request_id=f"mock_{uuid.uuid4().hex[:12]}",
+        query=query,
+        answer=f"This is a mock answer for development purposes. The API is not available or couldn't be connected to. Your query was: **{query}**",
+        sources=[
+            SourceDocument(
+                id="mock_doc_1",
+                title="Mock Documentation",
+                url="https://docs.exabomination.com/example",
+                chunk_id="mock_1",
+                content="This is simulated content for the mock response. It contains information related to your query about " + query,
+                relevance_score=0.95,
+                metadata=DocumentMetadata(
+                    document_type="use_case",
+                    vendor="microsoft",
+                    product="active_directory",
+                    created_at=datetime.now().isoformat(),
+                    updated_at=datetime.now().isoformat()
+                )
+            ),
+            SourceDocument(
+                id="mock_doc_2",
+                title="Additional Documentation",
+                url="https://docs.exabomination.com/related",
+                chunk_id="mock_2",
+                content="This is additional mock content related to " + query,
+                relevance_score=0.82,
+                metadata=DocumentMetadata(
+                    document_type="tutorial",
+                    vendor="cisco",
+                    product="asa",
+                    created_at=datetime.now().isoformat(),
+                    updated_at=datetime.now().isoformat()
+                )
+            )
+        ],
+        suggested_queries=[
+            f"How to configure {query}?",
+            f"What are the requirements for {query}?",
+            f"Tell me more about {query}"
+        ],
+        metadata=SearchMetadata(
+            processing_time_ms=125,
+            filter_count=len(filters.model_fields_set) if filters else 0,
+            total_matches=2,
+            threshold_applied=DEFAULT_THRESHOLD
         )
+    )
+
+def do_search(
+    query: str,
+    filters: Optional[SearchFilters],
+    use_mock: bool = False
+) -> Union[SearchResponse, ErrorResponse]:
+    """Search the API without touching the Streamlit UI or session state.
+    
+    Args:
+        query: The search query
+        filters: Search filters
+        use_mock: Return a mock response when the API cannot be reached
         
-        # Make API call
-        client = httpx.Client(timeout=30)
-        response = client.post(
-            api_url, 
-            headers=headers_dict,
-            content=search_request.model_dump_json()
+    Returns:
+        Search response, or error response if the search failed
+    """
+    try:
+        result = cached_search(
+            query,
+            _cache_key(filters),
+            DEFAULT_OPTIONS_KEY,
+            SEARCH_URL,
+            _search_body(query, filters)
         )
+    except httpx.RequestError as e:
+        # If in development mode, create mock response
+        if use_mock:
+            return _mock_search_response(query, filters)
         
-        if response.status_code == 200:
-            return SearchResponse.model_validate(response.json())
-        else:
-            return ErrorResponse.model_validate(response.json())
-    except Exception as e:
-        # Create error response
         return ErrorResponse(
             error={
                 "code": "connection_error",
@@ -105,10 +274,42 @@ def cached_search(query: str, filters_json: str, options_json: str, api_url: str
             },
             request_id=f"local_{int(time.time())}"
         )
+    
+    if not result["ok"]:
+        return ErrorResponse.model_validate(result["body"])
+    return SearchResponse.model_validate(result["body"])
+
+def _debug_direct_call(debug_container, body_json: str):
+    """Make a direct, non-cached search call and report on the response.
+    
+    Args:
+        debug_container: Streamlit container for the debug messages
+        body_json: JSON body of the search request
+    """
+    try:
+        direct_response = _HTTP.post(
+            SEARCH_URL,
+            headers=api_client.headers,
+            content=body_json
+        )
+        debug_container.info(f"Direct API call status: {direct_response.status_code}")
+        
+        # If successful, try to parse the response manually for debugging
+        if direct_response.status_code == 200:
+            try:
+                response_data = direct_response.json()
+                # Check a few key fields
+                debug_container.info(f"Response has {len(response_data.get('sources', []))} sources")
+                for i, source in enumerate(response_data.get('sources', [])[:3]):
+                    debug_container.info(f"Source {i} chunk_id: {source.get('chunk_id')} (type: {type(source.get('chunk_id')).__name__})")
+            except Exception as parse_err:
+                debug_container.warning(f"Failed to parse response: {str(parse_err)}")
+    except Exception as direct_err:
+        debug_container.warning(f"Direct API call failed: {str(direct_err)}")
 
 # Define search function
 def perform_search(query: str, filters: Dict[str, Any]):
-    """Perform search using the API client.
+    """Perform search and store the outcome in session state.
     
     Args:
         query: The search query
@@ -120,115 +321,18 @@ def perform_search(query: str, filters: Dict[str, Any]):
     
     # Show a debug message at the top
     debug_container = st.empty()
-    debug_container.info(f"Searching for: {query}")
-    
-    # Convert filters dict to SearchFilters object and serialize to JSON
-    search_filters = SearchFilters(**filters) if filters else None
-    filters_json = "" if search_filters is None else search_filters.model_dump_json()
-    
-    # Create search options and serialize to JSON
-    search_options = SearchOptions(
-        max_results=DEFAULT_MAX_RESULTS,
-        include_metadata=DEFAULT_INCLUDE_METADATA,
-        rerank=DEFAULT_RERANK,
-        threshold=DEFAULT_THRESHOLD
-    )
-    options_json = search_options.model_dump_json()
+    if DEBUG:
+        debug_container.info(f"Searching for: {query} at {SEARCH_URL}")
     
     try:
-        # Make API call using cached function
-        api_url = f"{api_client.base_url}/search"
-        debug_container.info(f"Calling API at: {api_url}")
+        # Convert filters dict to SearchFilters object
+        search_filters = SearchFilters(**filters) if filters else None
         
-        # Try a direct API call first for debugging
-        try:
-            search_request = SearchRequest(
-                query=query,
-                filters=search_filters,
-                options=search_options
-            )
-            direct_client = httpx.Client(timeout=30)
-            direct_response = direct_client.post(
-                api_url, 
-                headers=api_client.headers,
-                content=search_request.model_dump_json()
-            )
-            debug_container.info(f"Direct API call status: {direct_response.status_code}")
-            
-            # If successful, try to parse the response manually for debugging
-            if direct_response.status_code == 200:
-                try:
-                    response_data = direct_response.json()
-                    # Check a few key fields
-                    debug_container.info(f"Response has {len(response_data.get('sources', []))} sources")
-                    for i, source in enumerate(response_data.get('sources', [])[:3]):
-                        debug_container.info(f"Source {i} chunk_id: {source.get('chunk_id')} (type: {type(source.get('chunk_id')).__name__})")
-                except Exception as parse_err:
-                    debug_container.warning(f"Failed to parse response: {str(parse_err)}")
-        except Exception as direct_err:
-            debug_container.warning(f"Direct API call failed: {str(direct_err)}")
-            
-            # If in development mode, create mock response
-            if dev_mode:
-                debug_container.info("Using mock data in development mode")
-                import uuid
-                from datetime import datetime
-                
-                # Create mock search response
-                st.session_state.search_results = SearchResponse(
-                    request_id=f"mock_{uuid.uuid4().hex[:12]}",
-                    query=query,
-                    answer=f"This is a mock answer for development purposes. The API is not available or couldn't be connected to. Your query was: **{query}**",
-                    sources=[
-                        SourceDocument(
-                            id="mock_doc_1",
-                            title="Mock Documentation",
-                            url="https://docs.exabomination.com/example",
-                            chunk_id="mock_1",
-                            content="This is simulated content for the mock response. It contains information related to your query about " + query,
-                            relevance_score=0.95,
-                            metadata=DocumentMetadata(
-                                document_type="use_case",
-                                vendor="microsoft",
-                                product="active_directory",
-                                created_at=datetime.now().isoformat(),
-                                updated_at=datetime.now().isoformat()
-                            )
-                        ),
-                        SourceDocument(
-                            id="mock_doc_2",
-                            title="Additional Documentation",
-                            url="https://docs.exabomination.com/related",
-                            chunk_id="mock_2",
-                            content="This is additional mock content related to " + query,
-                            relevance_score=0.82,
-                            metadata=DocumentMetadata(
-                                document_type="tutorial",
-                                vendor="cisco",
-                                product="asa",
-                                created_at=datetime.now().isoformat(),
-                                updated_at=datetime.now().isoformat()
-                            )
-                        )
-                    ],
-                    suggested_queries=[
-                        f"How to configure {query}?",
-                        f"What are the requirements for {query}?",
-                        f"Tell me more about {query}"
-                    ],
-                    metadata=SearchMetadata(
-                        processing_time_ms=125,
-                        filter_count=len(filters) if filters else 0,
-                        total_matches=2,
-                        threshold_applied=DEFAULT_THRESHOLD
-                    )
-                )
-                
-                debug_container.success("Created mock response for development")
-                return
+        # Direct, non-cached call for debugging, enabled from the sidebar
+        if st.session_state.get("debug_direct_call", False):
+            _debug_direct_call(debug_container, _search_body(query, search_filters))
         
-        # If not in dev mode or direct API call was successful, use the cached function
-        result = cached_search(query, filters_json, options_json, api_url, api_client.headers)
+        result = do_search(query, search_filters, use_mock=dev_mode)
         
         # Check if result is an error
         if isinstance(result, ErrorResponse):
@@ -236,7 +340,8 @@ def perform_search(query: str, filters: Dict[str, Any]):
             debug_container.error(f"Search error: {result.error}")
         else:
             st.session_state.search_results = result
-            debug_container.success("Search successful!")
+            if DEBUG:
+                debug_container.success("Search successful!")
             
     except Exception as e:
         # Create an error response without importing locally
@@ -262,139 +367,232 @@ def handle_filter_change(filters: SearchFilters):
     Args:
         filters: Updated filters
     """
-    # Only re-run search if we have a current query
+    # Only re-run search if we have a current query. The filters panel only
+    # calls this when the filters hash changed, so reruns that leave the
+    # filters untouched never send a search.
     if st.session_state.current_query:
         perform_search(st.session_state.current_query, filters.model_dump())
+        # The filters panel is a fragment, so rerun the app to show new results
+        st.rerun()
 
 # Display the query history in the sidebar
 query_history_sidebar()
 
-# Import needed models at the module level
-from frontend.api.models import (
-    MetadataOptionsResponse, 
-    ErrorResponse,
-    SearchResponse,
-    SearchFilters,
-    SearchOptions,
-    SearchRequest
-)
-import httpx
-import time
-
-# Define a cached function outside of any class to fetch metadata options
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def fetch_metadata_options(api_url, headers_dict):
+# Define a cached function outside of any class to fetch metadata options.
+# The options are read-only, so all sessions share one instance.
+@st.cache_resource(ttl=3600)  # Cache for 1 hour
+def fetch_metadata_options(api_url, headers_items):
     """Fetch metadata options from API with caching.
     
     Args:
         api_url: Full API URL
-        headers_dict: Headers dictionary
+        headers_items: Headers as a sorted tuple of (name, value) pairs
         
     Returns:
         Metadata options or None if error
     """
     try:
-        client = httpx.Client(timeout=30)
-        response = client.get(api_url, headers=headers_dict)
+        response = _HTTP.get(api_url, headers=dict(headers_items))
         
         if response.status_code == 200:
-            return MetadataOptionsResponse.model_validate(response.json())
+            return MetadataOptionsResponse.model_validate(orjson.loads(response.content))
         return None
     except Exception as e:
         st.warning(f"Failed to fetch metadata options: {str(e)}")
         return None
 
-# Display API connection debug info 
-st.sidebar.write("### API Connection")
-st.sidebar.write(f"API URL: {api_client.base_url}")
-
-# Create an expandable section for detailed connection info
-with st.sidebar.expander("Connection Details", expanded=True):
-    # Get API URL config from environment
-    import os
-    from dotenv import load_dotenv
-    load_dotenv(".env.frontend")
+# Mock metadata never changes, so it is built once and shared
+@lru_cache(maxsize=1)
+def _mock_metadata() -> MetadataOptionsResponse:
+    """Build the metadata options used in development mode.
     
-    env_api_url = os.getenv("EXABOMINATION_API_URL", "Not set")
-    st.write(f"**Environment API URL:** {env_api_url}")
-    
-    # Test multiple possible API endpoints
-    import socket
-    import httpx
-    from urllib.parse import urlparse
+    Returns:
+        Mock metadata options, shared by all sessions
+    """
+    return MetadataOptionsResponse(
+        document_types=[
+            "use_case",
+            "parser",
+            "rule",
+            "data_source",
+            "overview",
+            "tutorial"
+        ],
+        vendors=[
+            "microsoft",
+            "cisco",
+            "okta",
+            "palo_alto",
+            "aws"
+        ],
+        products={
+            "microsoft": [
+                "active_directory",
+                "azure_ad",
+                "exchange_online",
+                "windows"
+            ],
+            "cisco": [
+                "asa",
+                "firepower",
+                "ise",
+                "meraki"
+            ],
+            "okta": [
+                "identity_cloud"
+            ]
+        },
+        use_cases=[
+            "account_takeover",
+            "data_exfiltration",
+            "lateral_movement",
+            "privilege_escalation"
+        ],
+        date_range={
+            "oldest": "2022-01-15",
+            "newest": "2025-03-27"
+        }
+    )
+
+# Ports probed besides the configured one when diagnosing the connection
+OTHER_API_PORTS = [8000, 8080, 5000, 3000]
+
+def check_port_open(host: str, port: int) -> bool:
+    """Check if a port is open on a host (IPv4 or IPv6)."""
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+def probe_health(host: str, port: int) -> Dict[str, Any]:
+    """Request the health endpoint on a host and port.
     
-    def check_port_open(host, port):
-        """Check if a port is open on a host."""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            return result == 0
-        except:
-            return False
+    Args:
+        host: Host to probe
+        port: Port to probe
+        
+    Returns:
+        Dictionary with the URL, status code, response body and error
+    """
+    health_url = f"http://{host}:{port}/health"
+    probe = {"url": health_url, "status_code": None, "body": None, "error": None}
+    try:
+        response = _HTTP.get(health_url, timeout=1)
+        probe["status_code"] = response.status_code
+        if response.status_code == 200:
+            probe["body"] = response.json() if response.headers.get('content-type') == 'application/json' else response.text
+    except Exception as e:
+        probe["error"] = str(e)
+    return probe
+
+# Define a cached function so the probes run at most once a minute, not per rerun
+@st.cache_data(ttl=60)
+def diagnose_api(base_url: str) -> Dict[str, Any]:
+    """Probe the API host for open ports, listening processes and health endpoints.
     
+    Args:
+        base_url: Configured API base URL
+        
+    Returns:
+        Dictionary with the probed host and port, the open state of each port,
+        listening sockets and the health endpoint result for each port
+    """
     # Parse the current API URL
-    parsed_url = urlparse(api_client.base_url)
+    parsed_url = urlparse(base_url)
     host = parsed_url.hostname or 'localhost'
     port = parsed_url.port or 8888
+    ports_to_try = [port] + OTHER_API_PORTS
     
-    # Check the configured port
-    if check_port_open(host, port):
-        st.success(f"✅ Port {port} is open on {host}")
-    else:
-        st.error(f"❌ Port {port} is not accessible on {host}")
+    # Probe all ports and health endpoints in parallel, so the wall time is
+    # one timeout rather than the sum of them
+    with ThreadPoolExecutor(max_workers=2 * len(ports_to_try)) as executor:
+        open_ports = executor.map(partial(check_port_open, host), ports_to_try)
+        health = executor.map(partial(probe_health, host), ports_to_try)
+        
+        diagnostics = {
+            "host": host,
+            "port": port,
+            "open_ports": dict(zip(ports_to_try, open_ports)),
+            "listeners": None,
+            "listeners_error": None,
+            "health": dict(zip(ports_to_try, health))
+        }
     
-    # Check other common ports
-    other_ports = [8000, 8080, 5000, 3000]
-    st.write("### Checking other common ports:")
+    # Try to list listening sockets and their processes
+    if psutil is None:
+        diagnostics["listeners_error"] = "Could not list running processes: psutil is not installed"
+    else:
+        try:
+            conns = [
+                (c.laddr.port, c.pid, c.status)
+                for c in psutil.net_connections(kind="inet")
+                if c.status == psutil.CONN_LISTEN
+            ]
+            diagnostics["listeners"] = "\n".join(
+                f"{conn_port:5d} pid={pid} {status}"
+                for conn_port, pid, status in sorted(conns, key=lambda conn: conn[0])
+            )
+        except Exception as e:
+            diagnostics["listeners_error"] = f"Could not list running processes: {str(e)}"
     
-    for test_port in other_ports:
-        if check_port_open(host, test_port):
-            st.success(f"✅ Port {test_port} is open on {host}")
+    return diagnostics
+
+# Display API connection debug info 
+st.sidebar.write("### API Connection")
+st.sidebar.write(f"API URL: {api_client.base_url}")
+
+# Detailed connection info is opt-in so normal reruns never pay for the probes
+if st.sidebar.checkbox("Show diagnostics", value=False):
+    with st.sidebar.expander("Connection Details", expanded=True):
+        st.write(f"**Environment API URL:** {ENV_API_URL}")
+        
+        diagnostics = diagnose_api(api_client.base_url)
+        host = diagnostics["host"]
+        port = diagnostics["port"]
+        
+        # Check the configured port
+        if diagnostics["open_ports"][port]:
+            st.success(f"✅ Port {port} is open on {host}")
         else:
-            st.warning(f"❌ Port {test_port} is not accessible on {host}")
-    
-    # Try to list running processes with ports (Linux only)
-    try:
-        import subprocess
+            st.error(f"❌ Port {port} is not accessible on {host}")
+        
+        # Check other common ports
+        st.write("### Checking other common ports:")
+        
+        for test_port in OTHER_API_PORTS:
+            if diagnostics["open_ports"][test_port]:
+                st.success(f"✅ Port {test_port} is open on {host}")
+            else:
+                st.warning(f"❌ Port {test_port} is not accessible on {host}")
+        
+        # Running processes with ports
         st.write("### Running processes with network ports:")
-        result = subprocess.run(
-            ["netstat", "-tulpn"], 
-            capture_output=True, 
-            text=True, 
-            timeout=5
-        )
-        if result.returncode == 0:
-            st.code(result.stdout)
+        if diagnostics["listeners"] is not None:
+            st.code(diagnostics["listeners"])
         else:
-            st.error(f"Failed to run netstat: {result.stderr}")
-    except Exception as e:
-        st.warning(f"Could not list running processes: {str(e)}")
-    
-    # Try connecting to health endpoints on different ports
-    ports_to_try = [port] + other_ports
-    for test_port in ports_to_try:
-        health_url = f"http://{host}:{test_port}/health"
-        st.write(f"Testing health endpoint: {health_url}")
+            st.warning(diagnostics["listeners_error"])
         
-        try:
-            response = httpx.get(health_url, timeout=1)
-            if response.status_code == 200:
+        # Health endpoints on different ports
+        for test_port, probe in diagnostics["health"].items():
+            st.write(f"Testing health endpoint: {probe['url']}")
+            
+            if probe["error"] is not None:
+                st.warning(f"Could not connect to {probe['url']}: {probe['error']}")
+            elif probe["status_code"] == 200:
                 st.success(f"✅ Health endpoint accessible on port {test_port}!")
-                st.json(response.json() if response.headers.get('content-type') == 'application/json' else response.text)
+                st.json(probe["body"])
                 
                 # If this is not our configured port, suggest updating the config
                 if test_port != port:
                     st.info(f"Consider updating EXABOMINATION_API_URL in .env.frontend to use port {test_port}")
             else:
-                st.error(f"API returned error: {response.status_code}")
-        except Exception as e:
-            st.warning(f"Could not connect to {health_url}: {str(e)}")
+                st.error(f"API returned error: {probe['status_code']}")
     
 # Add dev mode toggle for when API is not available
 with st.sidebar:
     dev_mode = st.checkbox("Development Mode (Mock Data)", value=True)
+    st.checkbox("Debug direct call", key="debug_direct_call", value=False)
 
 # Display the filters panel
 try:
@@ -402,89 +600,40 @@ try:
     if st.session_state.metadata_options is None:
         # Fetch metadata options from API using the cached function
         api_url = f"{api_client.base_url}/metadata/options"
-        st.sidebar.write(f"Metadata URL: {api_url}")
+        if DEBUG:
+            st.sidebar.write(f"Metadata URL: {api_url}")
         
         # Direct, non-cached call for debugging (don't show headers in UI)
         try:
-            direct_response = httpx.get(api_url, headers=api_client.headers, timeout=5)
-            st.sidebar.write(f"Direct metadata call status: {direct_response.status_code}")
-            if direct_response.status_code == 200:
-                st.sidebar.write("Direct call successful")
-            else:
-                st.sidebar.write(f"Direct response: {direct_response.text[:100]}...")
+            direct_response = _HTTP.get(api_url, headers=api_client.headers, timeout=5)
+            if DEBUG:
+                st.sidebar.write(f"Direct metadata call status: {direct_response.status_code}")
+                if direct_response.status_code == 200:
+                    st.sidebar.write("Direct call successful")
+                else:
+                    st.sidebar.write(f"Direct response: {direct_response.text[:100]}...")
         except Exception as e:
             st.sidebar.error(f"Direct metadata call failed: {str(e)}")
             
             # If in dev mode and API is not available, create mock metadata
             if dev_mode:
                 st.sidebar.info("Using mock metadata in development mode")
-                st.session_state.metadata_options = MetadataOptionsResponse(
-                    document_types=[
-                        "use_case",
-                        "parser",
-                        "rule",
-                        "data_source",
-                        "overview",
-                        "tutorial"
-                    ],
-                    vendors=[
-                        "microsoft",
-                        "cisco",
-                        "okta",
-                        "palo_alto",
-                        "aws"
-                    ],
-                    products={
-                        "microsoft": [
-                            "active_directory",
-                            "azure_ad",
-                            "exchange_online",
-                            "windows"
-                        ],
-                        "cisco": [
-                            "asa",
-                            "firepower",
-                            "ise",
-                            "meraki"
-                        ],
-                        "okta": [
-                            "identity_cloud"
-                        ]
-                    },
-                    use_cases=[
-                        "account_takeover",
-                        "data_exfiltration",
-                        "lateral_movement",
-                        "privilege_escalation"
-                    ],
-                    date_range={
-                        "oldest": "2022-01-15",
-                        "newest": "2025-03-27"
-                    }
-                )
+                st.session_state.metadata_options = _mock_metadata()
         
         # Try cached call if no mock data was set
         if st.session_state.metadata_options is None:
-            metadata_options = fetch_metadata_options(api_url, api_client.headers)
+            metadata_options = fetch_metadata_options(api_url, tuple(sorted(api_client.headers.items())))
             if metadata_options:
                 st.session_state.metadata_options = metadata_options
-                st.sidebar.success("Metadata options loaded successfully")
+                if DEBUG:
+                    st.sidebar.success("Metadata options loaded successfully")
             else:
                 st.sidebar.warning("Failed to load metadata options from API")
                 
                 # If all attempts failed and we're in dev mode, use mock data
                 if dev_mode and st.session_state.metadata_options is None:
                     st.sidebar.info("Using mock metadata in development mode")
-                    st.session_state.metadata_options = MetadataOptionsResponse(
-                        document_types=["use_case", "parser", "rule"],
-                        vendors=["microsoft", "cisco"],
-                        products={
-                            "microsoft": ["active_directory", "windows"],
-                            "cisco": ["asa", "firepower"]
-                        },
-                        use_cases=["account_takeover", "lateral_movement"],
-                        date_range={"oldest": "2022-01-15", "newest": "2025-03-27"}
-                    )
+                    st.session_state.metadata_options = _mock_metadata()
     
     # Use available metadata options 
     filters = filters_panel(handle_filter_change, st.session_state.metadata_options)
@@ -1,17 +1,24 @@
 """Filters panel component for the EXASPERATION frontend."""
 
+import hashlib
+
+import orjson
 import streamlit as st
 from typing import Dict, List, Any, Optional, Callable
 
 from frontend.api.models import SearchFilters, MetadataOptionsResponse
 
 
+@st.fragment
 def filters_panel(
     on_filter_change: Callable[[SearchFilters], None],
     metadata_options: Optional[MetadataOptionsResponse] = None
 ) -> SearchFilters:
     """Render the search filters panel component.
     
+    Runs as a fragment, so interacting with a filter widget only reruns this
+    panel. The callback is invoked when the filter values actually change.
+    
     Args:
         on_filter_change: Callback function when filters change
         metadata_options: Available metadata options for filtering
@@ -50,6 +57,7 @@ def filters_panel(
                 if created_before:
                     filters.created_before = created_before.isoformat()
         
+        _notify_if_changed(filters, on_filter_change)
         return filters
     
     # Full filter UI with metadata options
@@ -127,10 +135,46 @@ def filters_panel(
     if st.sidebar.button("Clear All Filters", key="clear_filters"):
         st.session_state.filters = SearchFilters()
         filters = st.session_state.filters
-        # Call the callback to notify about filter changes
-        on_filter_change(filters)
     
     # Update filters in session state
     st.session_state.filters = filters
     
-    return filters
\ No newline at end of file
+    # Call the callback to notify about filter changes
+    _notify_if_changed(filters, on_filter_change)
+    
+    return filters
+
+
+def _notify_if_changed(
+    filters: SearchFilters,
+    on_filter_change: Callable[[SearchFilters], None]
+):
+    """Invoke the filter change callback if the filters differ from the last run.
+    
+    Args:
+        filters: Current filter settings
+        on_filter_change: Callback function when filters change
+    """
+    new_hash = filters_hash(filters)
+    
+    # The first render only records the initial filters
+    if "filters_hash" not in st.session_state:
+        st.session_state.filters_hash = new_hash
+        return
+    
+    if new_hash != st.session_state.filters_hash:
+        st.session_state.filters_hash = new_hash
+        on_filter_change(filters)
+
+
+def filters_hash(filters: SearchFilters) -> bytes:
+    """Build a stable digest of the set filter values.
+    
+    Args:
+        filters: Filter settings
+        
+    Returns:
+        Digest of the canonical JSON of the filters
+    """
+    canonical = orjson.dumps(filters.model_dump(exclude_none=True), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=8).digest()
\ No newline at end of file
@@ -3,45 +3,90 @@
 import streamlit as st
 from typing import Dict, List, Any, Optional
 
+# Column layout of the Previous/Next/Skip tour buttons
+_TOUR_COL_RATIOS = (1, 1, 5)
+
+# Static help text, built once at import instead of on every rerun
+_HELP_MD = """
+## How to Use EXASPERATION
+
+EXASPERATION is a search assistant for Exabeam documentation.
+
+### Basic Search
+
+1. Enter your question in the search box
+2. Click "Search" or press Enter
+3. View the generated answer and sources
+
+### Advanced Features
+
+- **Filters**: Use the sidebar to filter by document type, vendor, or product
+- **Examples**: Click on example questions for quick searches
+- **History**: View and reuse your previous searches from the sidebar
+- **Feedback**: Rate answers to help improve results
+
+### Search Tips
+
+- Be specific in your questions
+- Include product names when asking about specific integrations
+- Mention "rule", "parser", or "use case" when looking for specific content types
+- For MITRE ATT&CK related queries, include the technique ID if known
+"""
+
+_SHORTCUTS_MD = """
+### Keyboard Shortcuts
+
+- **Ctrl+Enter** - Submit search
+- **Esc** - Clear search input
+- **?** - Show this help
+"""
+
+_FAQ_MD = """
+### Frequently Asked Questions
+
+#### What type of questions can I ask?
+
+You can ask any question related to Exabeam documentation, including:
+- How specific features work
+- Details about data sources and parsers
+- Configuration instructions
+- Use case implementations
+- Troubleshooting steps
+
+#### How are the answers generated?
+
+Answers are generated using a Retrieval Augmented Generation (RAG) system:
+1. Your query is processed and expanded with relevant security terminology
+2. The system searches a database of Exabeam documentation
+3. Relevant documents are retrieved and ranked by relevance
+4. An AI model generates a concise answer based on these documents
+5. The system includes citations to help you verify the information
+
+#### How can I improve the results?
+
+- Be specific in your questions
+- Use proper terminology when possible
+- Provide context about what you're trying to achieve
+- Use the feedback buttons to indicate helpful or unhelpful answers
+- Try rephrasing your question if you don't get a satisfactory answer
+
+#### Are there usage limits?
+
+During this initial release, there are no strict usage limits. However, we recommend:
+- Focus on work-related queries about Exabeam documentation
+- Avoid submitting the same query multiple times in succession
+- Use the search history feature to revisit previous queries
+"""
+
 
 def help_system():
     """Render the help system in the sidebar."""
     with st.sidebar.expander("Help & Documentation", expanded=False):
-        st.markdown("""
-        ## How to Use EXASPERATION
-        
-        EXASPERATION is a search assistant for Exabeam documentation.
-        
-        ### Basic Search
-        
-        1. Enter your question in the search box
-        2. Click "Search" or press Enter
-        3. View the generated answer and sources
-        
-        ### Advanced Features
-        
-        - **Filters**: Use the sidebar to filter by document type, vendor, or product
-        - **Examples**: Click on example questions for quick searches
-        - **History**: View and reuse your previous searches from the sidebar
-        - **Feedback**: Rate answers to help improve results
-        
-        ### Search Tips
-        
-        - Be specific in your questions
-        - Include product names when asking about specific integrations
-        - Mention "rule", "parser", or "use case" when looking for specific content types
-        - For MITRE ATT&CK related queries, include the technique ID if known
-        """)
+        st.markdown(_HELP_MD)
         
         st.markdown("---")
         
-        st.markdown("""
-        ### Keyboard Shortcuts
-        
-        - **Ctrl+Enter** - Submit search
-        - **Esc** - Clear search input
-        - **?** - Show this help
-        """)
+        st.markdown(_SHORTCUTS_MD)
 
 
 def show_tooltip(text: str, tooltip: str, icon: str = "ℹ️"):
@@ -52,11 +97,7 @@ def show_tooltip(text: str, tooltip: str, icon: str = "ℹ️"):
         tooltip: Tooltip content
         icon: Icon to display for the tooltip
     """
-    col1, col2 = st.columns([0.9, 0.1])
-    with col1:
-        st.write(text)
-    with col2:
-        st.write(f"<span title='{tooltip}'>{icon}</span>", unsafe_allow_html=True)
+    st.markdown(f"{text} <span title='{tooltip}'>{icon}</span>", unsafe_allow_html=True)
 
 
 def guided_tour():
@@ -112,7 +153,7 @@ def guided_tour():
             st.markdown(f"## {step['title']}")
             st.markdown(step['content'])
             
-            col1, col2, col3 = st.columns([1, 1, 5])
+            col1, col2, col3 = st.columns(_TOUR_COL_RATIOS)
             with col1:
                 if st.button("Previous", key="tour_prev", disabled=st.session_state.tour_step == 0):
                     st.session_state.tour_step -= 1
@@ -134,42 +175,7 @@ def guided_tour():
 def faq_section():
     """Show frequently asked questions."""
     with st.expander("Frequently Asked Questions", expanded=False):
-        st.markdown("""
-        ### Frequently Asked Questions
-        
-        #### What type of questions can I ask?
-        
-        You can ask any question related to Exabeam documentation, including:
-        - How specific features work
-        - Details about data sources and parsers
-        - Configuration instructions
-        - Use case implementations
-        - Troubleshooting steps
-        
-        #### How are the answers generated?
-        
-        Answers are generated using a Retrieval Augmented Generation (RAG) system:
-        1. Your query is processed and expanded with relevant security terminology
-        2. The system searches a database of Exabeam documentation
-        3. Relevant documents are retrieved and ranked by relevance
-        4. An AI model generates a concise answer based on these documents
-        5. The system includes citations to help you verify the information
-        
-        #### How can I improve the results?
-        
-        - Be specific in your questions
-        - Use proper terminology when possible
-        - Provide context about what you're trying to achieve
-        - Use the feedback buttons to indicate helpful or unhelpful answers
-        - Try rephrasing your question if you don't get a satisfactory answer
-        
-        #### Are there usage limits?
-        
-        During this initial release, there are no strict usage limits. However, we recommend:
-        - Focus on work-related queries about Exabeam documentation
-        - Avoid submitting the same query multiple times in succession
-        - Use the search history feature to revisit previous queries
-        """)
+        st.markdown(_FAQ_MD)
 
 
 # Create help content that can be inserted into the app
@@ -1,8 +1,17 @@
 """Notifications component for the EXASPERATION frontend."""
 
+import heapq
+import time
 import streamlit as st
 from typing import Optional, Dict, Any
-import uuid
+
+# Streamlit element used for each notification type ("loading" is special)
+_RENDERERS = {
+    "success": st.success,
+    "error": st.error,
+    "info": st.info,
+    "warning": st.warning
+}
 
 
 class NotificationSystem:
@@ -11,8 +20,22 @@ class NotificationSystem:
     def __init__(self):
         """Initialize the notification system."""
         # Create notifications in session state if they don't exist
+        self._state()
+    
+    @staticmethod
+    def _state() -> Dict[str, Any]:
+        """Get the notification state of the current session.
+        
+        Notifications are kept in insertion order by ID, with a min-heap of
+        (expires_at, id) for the ones that expire. Cleared notifications are
+        only removed from "items"; their heap entries are skipped on expiry.
+        
+        Returns:
+            Dictionary with "items" and "expiry_heap"
+        """
         if "notifications" not in st.session_state:
-            st.session_state.notifications = []
+            st.session_state.notifications = {"items": {}, "expiry_heap": []}
+        return st.session_state.notifications
     
     def _add_notification(self, message: str, notification_type: str, 
                           duration: Optional[int] = None) -> str:
@@ -26,15 +49,22 @@ class NotificationSystem:
         Returns:
             Notification ID
         """
-        notification_id = str(uuid.uuid4())
+        # IDs only need to be unique within the session; the counter is kept
+        # outside the notification state so clear() does not reuse IDs
+        st.session_state._notif_seq = st.session_state.get("_notif_seq", 0) + 1
+        notification_id = str(st.session_state._notif_seq)
+        created_at = time.monotonic()
+        state = self._state()
         
-        st.session_state.notifications.append({
+        state["items"][notification_id] = {
             "id": notification_id,
             "message": message,
             "type": notification_type,
             "duration": duration,
-            "created_at": st.session_state.get("_current_time", 0)
-        })
+            "created_at": created_at
+        }
+        if duration is not None:
+            heapq.heappush(state["expiry_heap"], (created_at + duration, notification_id))
         
         return notification_id
     
@@ -104,33 +134,27 @@ class NotificationSystem:
             notification_id: Specific notification ID to clear (None for all)
         """
         if notification_id is None:
-            st.session_state.notifications = []
+            st.session_state.notifications = {"items": {}, "expiry_heap": []}
         else:
-            st.session_state.notifications = [
-                n for n in st.session_state.notifications 
-                if n["id"] != notification_id
-            ]
+            self._state()["items"].pop(notification_id, None)
     
     def render(self) -> None:
         """Render all active notifications."""
         if "notifications" not in st.session_state:
             return
-            
-        # Update current time
-        if "_current_time" not in st.session_state:
-            st.session_state._current_time = 0
-        else:
-            st.session_state._current_time += 1
-            
+        
+        state = st.session_state.notifications
+        items = state["items"]
+        expiry_heap = state["expiry_heap"]
+        
         # Remove expired notifications
-        st.session_state.notifications = [
-            n for n in st.session_state.notifications
-            if n["duration"] is None or 
-               (st.session_state._current_time - n["created_at"]) // 10 < n["duration"]
-        ]
+        now = time.monotonic()
+        while expiry_heap and expiry_heap[0][0] <= now:
+            _, notification_id = heapq.heappop(expiry_heap)
+            items.pop(notification_id, None)
         
         # Render each notification
-        for notification in st.session_state.notifications:
+        for notification in items.values():
             self._render_notification(notification)
     
     def _render_notification(self, notification: Dict[str, Any]) -> None:
@@ -142,17 +166,11 @@ class NotificationSystem:
         notification_type = notification["type"]
         message = notification["message"]
         
-        if notification_type == "success":
-            st.success(message)
-        elif notification_type == "error":
-            st.error(message)
-        elif notification_type == "info":
-            st.info(message)
-        elif notification_type == "warning":
-            st.warning(message)
-        elif notification_type == "loading":
+        if notification_type == "loading":
             with st.spinner(message):
                 pass
+        else:
+            _RENDERERS.get(notification_type, st.info)(message)
 
 
 # Create a singleton instance
@@ -6,6 +6,22 @@ from datetime import datetime
 
 from frontend.api.models import SearchResponse, SourceDocument, ErrorResponse, FeedbackResponse
 
+# Column layouts: feedback/copy buttons, and follow-up suggestion columns
+_FEEDBACK_COL_RATIOS = (1, 1, 5)
+_FOLLOWUP_COLUMNS = 2
+
+# Welcome text shown before the first search
+_WELCOME_MD = """
+## Welcome to EXASPERATION
+
+Use the search box above to ask questions about Exabeam documentation.
+
+### Examples:
+- How does the password reset detection rule work?
+- What events are monitored for lateral movement detection?
+- How do I set up the AWS CloudTrail data source?
+"""
+
 
 def results_display(result: Optional[SearchResponse] = None, error: Optional[ErrorResponse] = None):
     """Render the search results component.
@@ -26,26 +42,14 @@ def results_display(result: Optional[SearchResponse] = None, error: Optional[Err
     if result is None:
         # First-time visit, show welcome message
         if "current_query" not in st.session_state:
-            st.markdown(
-                """
-                ## Welcome to EXASPERATION
-                
-                Use the search box above to ask questions about Exabeam documentation.
-                
-                ### Examples:
-                - How does the password reset detection rule work?
-                - What events are monitored for lateral movement detection?
-                - How do I set up the AWS CloudTrail data source?
-                """
-            )
+            st.markdown(_WELCOME_MD)
         return
     
     # Display the answer with proper styling
-    st.markdown("### Answer")
-    st.markdown(result.answer)
+    st.markdown(f"### Answer\n\n{result.answer}")
     
     # Add feedback buttons
-    col1, col2, col3 = st.columns([1, 1, 5])
+    col1, col2, col3 = st.columns(_FEEDBACK_COL_RATIOS)
     with col1:
         if st.button("👍 Helpful", key="feedback_positive"):
             _submit_feedback(result.request_id, "positive")
@@ -67,15 +71,15 @@ Source: EXASPERATION - Exabeam Documentation Search Assistant
     # Display sources header
     if result.sources and len(result.sources) > 0:
         st.markdown("### Sources")
-        _display_sources(result.sources)
+        _display_sources(result.request_id, result.sources)
     
     # Display suggested follow-up queries
     if result.suggested_queries and len(result.suggested_queries) > 0:
         st.markdown("### Follow-up Questions")
-        cols = st.columns(2)  # 2 columns for follow-up suggestions
+        cols = st.columns(_FOLLOWUP_COLUMNS)
         
         for i, suggested_query in enumerate(result.suggested_queries):
-            with cols[i % 2]:
+            with cols[i % _FOLLOWUP_COLUMNS]:
                 if st.button(
                     suggested_query, 
                     key=f"suggested_{i}",
@@ -87,38 +91,67 @@ Source: EXASPERATION - Exabeam Documentation Search Assistant
     
     # Display metadata at the bottom
     if st.button("Show Request Details", key="show_details"):
-        st.markdown("#### Request Details")
-        st.markdown(f"**Request ID:** {result.request_id}")
-        st.markdown(f"**Processing Time:** {result.metadata.processing_time_ms} ms")
-        st.markdown(f"**Total Matches:** {result.metadata.total_matches}")
-        st.markdown(f"**Relevance Threshold:** {result.metadata.threshold_applied}")
+        st.markdown("\n\n".join([
+            "#### Request Details",
+            f"**Request ID:** {result.request_id}",
+            f"**Processing Time:** {result.metadata.processing_time_ms} ms",
+            f"**Total Matches:** {result.metadata.total_matches}",
+            f"**Relevance Threshold:** {result.metadata.threshold_applied}"
+        ]))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _format_source_block(request_id: str, index: int, source_id: str, _source: SourceDocument) -> str:
+    """Format the header, relevance, metadata and link of a source.
+    
+    A response never changes for a request ID, so the block is cached on
+    (request_id, index, source_id) and the source itself is not hashed.
+    
+    Args:
+        request_id: Request ID of the search response
+        index: Position of the source in the response
+        source_id: Source document ID
+        _source: Source document to format
+        
+    Returns:
+        Markdown for the source
+    """
+    # Use a default title if none is provided
+    title = _source.title if _source.title else f"Document {source_id}"
+    
+    # Format metadata
+    metadata = _source.metadata
+    metadata_str = " | ".join(
+        f"**{label}:** {value}"
+        for label, value in (
+            ("Type", metadata.document_type),
+            ("Vendor", metadata.vendor),
+            ("Product", metadata.product)
+        )
+        if value
+    )
+    
+    return "\n\n".join([
+        f"#### Source {index+1}: {title}",
+        f"**Relevance Score:** {_source.relevance_score:.2f}",
+        metadata_str,
+        # Display source URL as a clickable link
+        f"[View Source Document]({_source.url})"
+    ])
 
 
-def _display_sources(sources: List[SourceDocument]):
+def _display_sources(request_id: str, sources: List[SourceDocument]):
     """Display source documents with formatting.
     
     Args:
+        request_id: Request ID of the search response
         sources: List of source documents to display
     """
     for i, source in enumerate(sources):
-        # Use a default title if none is provided
-        title = source.title if source.title else f"Document {source.id}"
-        st.markdown(f"#### Source {i+1}: {title}")
-        st.markdown(f"**Relevance Score:** {source.relevance_score:.2f}")
-        
-        # Format metadata
-        metadata_str = []
-        if source.metadata.document_type:
-            metadata_str.append(f"**Type:** {source.metadata.document_type}")
-        if source.metadata.vendor:
-            metadata_str.append(f"**Vendor:** {source.metadata.vendor}")
-        if source.metadata.product:
-            metadata_str.append(f"**Product:** {source.metadata.product}")
-        
-        st.markdown(" | ".join(metadata_str))
-        
-        # Display source URL as a clickable link
-        st.markdown(f"[View Source Document]({source.url})")
+        # Emit the separator before each source after the first, together
+        # with the source block, so each source costs one markdown message
+        block = _format_source_block(request_id, i, source.id, source)
+        st.markdown(f"---\n\n{block}" if i > 0 else block)
         
         # Display a collapsible section for content
         # Instead of using a nested expander, use a button to toggle content
@@ -131,13 +164,9 @@ def _display_sources(sources: List[SourceDocument]):
             # Format the content nicely
             if source.content:
                 # Use markdown for better formatting
-                st.markdown("##### Content:")
-                st.markdown(source.content)
+                st.markdown(f"##### Content:\n\n{source.content}")
             else:
                 st.info("No content available for this source.")
-        
-        if i < len(sources) - 1:  # Add separator except after last source
-            st.markdown("---")
 
 
 def _submit_feedback(request_id: str, rating: str):
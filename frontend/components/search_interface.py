@@ -1,11 +1,16 @@
 """Search interface component for the EXASPERATION frontend."""
 
+from collections import OrderedDict
+
 import streamlit as st
 from typing import Callable, Optional, List, Dict, Any
 
 from frontend.config import EXAMPLE_QUERIES
 from frontend.utils.api_client import api_client
 
+# Number of recent queries kept in the history
+QUERY_HISTORY_SIZE = 10
+
 
 def search_interface(
     on_search: Callable[[str, Dict[str, Any]], None],
@@ -20,9 +25,10 @@ def search_interface(
     Returns:
         Current query text
     """
-    # Initialize session state for query history if it doesn't exist
-    if "query_history" not in st.session_state:
-        st.session_state.query_history = []
+    # Initialize session state for query history if it doesn't exist.
+    # The history is an LRU ordered from oldest to most recent query.
+    if "query_history_lru" not in st.session_state:
+        st.session_state.query_history_lru = OrderedDict()
     
     # Get current query from session state or initialize it
     current_query = st.session_state.get("current_query", "")
@@ -74,29 +80,32 @@ def search_interface(
     if submit_button and query and not loading:
         st.session_state.current_query = query
         
-        # Add to query history if not already present
-        if query not in st.session_state.query_history:
-            st.session_state.query_history = [query] + st.session_state.query_history
-            if len(st.session_state.query_history) > 10:  # Limit history size
-                st.session_state.query_history = st.session_state.query_history[:10]
+        # Add to query history, moving a repeated query to the front
+        history = st.session_state.query_history_lru
+        history.pop(query, None)
+        history[query] = None
+        while len(history) > QUERY_HISTORY_SIZE:  # Limit history size
+            history.popitem(last=False)
         
         # Call the search callback
         on_search(query, {})
     
-    # Show example queries (moved outside the form)
+    # Show example queries (moved outside the form) as a single widget
     with st.expander("Example questions", expanded=False):
-        example_cols = st.columns(2)
-        for i, example in enumerate(EXAMPLE_QUERIES):
-            with example_cols[i % 2]:
-                if st.button(
-                    example, 
-                    key=f"example_{i}",
-                    use_container_width=True,
-                    disabled=loading
-                ):
-                    # Set the example as the current query and trigger search
-                    st.session_state.current_query = example
-                    on_search(example, {})
+        st.radio(
+            "Example questions",
+            options=EXAMPLE_QUERIES,
+            index=None,
+            key="example_radio",
+            on_change=_select_example,
+            disabled=loading,
+            label_visibility="collapsed"
+        )
+    
+    # Set the chosen example as the current query and trigger search
+    example = st.session_state.pop("_selected_example", None)
+    if example and not loading:
+        on_search(example, {})
     
     # Show loading indicator if search is in progress
     if loading:
@@ -105,20 +114,44 @@ def search_interface(
     return query
 
 
+def _select_example():
+    """Handle a choice in the example questions radio."""
+    example = st.session_state.example_radio
+    if example:
+        st.session_state.current_query = example
+        st.session_state._selected_example = example
+    # Clear the selection so choosing the same example again fires on_change
+    st.session_state.example_radio = None
+
+
+def _select_history():
+    """Handle a choice in the recent searches radio.
+    
+    Runs as a widget callback, before the script reruns, so the main query
+    field picks up the chosen query without an extra rerun.
+    """
+    past_query = st.session_state.history_radio
+    if past_query:
+        st.session_state.current_query = past_query
+    # Clear the selection so choosing the same query again fires on_change
+    st.session_state.history_radio = None
+
+
 def query_history_sidebar():
     """Display search query history in the sidebar."""
-    if "query_history" in st.session_state and len(st.session_state.query_history) > 0:
+    if "query_history_lru" in st.session_state and len(st.session_state.query_history_lru) > 0:
         st.sidebar.header("Recent Searches")
         
-        for i, past_query in enumerate(st.session_state.query_history):
-            if st.sidebar.button(
-                past_query, 
-                key=f"history_{i}",
-                use_container_width=True
-            ):
-                st.session_state.current_query = past_query
-                st.rerun()  # Trigger rerun to update the main query field
+        # Most recent query first
+        st.sidebar.radio(
+            "Recent Searches",
+            options=list(reversed(st.session_state.query_history_lru)),
+            index=None,
+            key="history_radio",
+            on_change=_select_history,
+            label_visibility="collapsed"
+        )
     
         if st.sidebar.button("Clear History", type="secondary"):
-            st.session_state.query_history = []
+            st.session_state.query_history_lru = OrderedDict()
             st.rerun()
\ No newline at end of file
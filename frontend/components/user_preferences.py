@@ -1,25 +1,87 @@
 """User preferences component for the EXASPERATION frontend."""
 
+from types import MappingProxyType
+
 import streamlit as st
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
+
+# Read-only template of the default preferences; sessions get a copy
+_DEFAULT_PREFERENCES = MappingProxyType({
+    "theme": "light",
+    "result_display": MappingProxyType({
+        "expand_sources": True,
+        "show_metadata": True,
+        "max_sources": 5
+    }),
+    "notifications": MappingProxyType({
+        "enable_sound": False,
+        "enable_toast": True
+    })
+})
+
+# Key paths of the preferences set from the settings panel, pre-split so
+# set_preference does not split them on every rerun
+_KEY_PATHS = {
+    key_path: tuple(key_path.split("."))
+    for key_path in (
+        "theme",
+        "result_display.expand_sources",
+        "result_display.show_metadata",
+        "result_display.max_sources",
+        "notifications.enable_toast"
+    )
+}
+
+
+def _flatten(prefs: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Map every dot-notation path in a preferences dict to its value.
+    
+    Args:
+        prefs: Nested preferences
+        prefix: Path of prefs within the full preferences
+        
+    Returns:
+        Flat dictionary keyed by dot-notation path
+    """
+    flat = {}
+    for key, value in prefs.items():
+        path = prefix + key
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+    return flat
+
+
+def _copy_preferences(template: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy a preferences template into plain, mutable dicts.
+    
+    Args:
+        template: Nested preferences mapping
+        
+    Returns:
+        Nested preferences dict
+    """
+    return {
+        key: _copy_preferences(value) if isinstance(value, Mapping) else value
+        for key, value in template.items()
+    }
+
+
+def _store_preferences(prefs: Dict[str, Any]) -> None:
+    """Replace the preferences and rebuild the flat lookup.
+    
+    Args:
+        prefs: Nested preferences
+    """
+    st.session_state.preferences = prefs
+    st.session_state._preferences_flat = _flatten(prefs)
 
 
 def user_preferences():
     """Render user preferences panel in the sidebar."""
     if "preferences" not in st.session_state:
         # Initialize default preferences
-        st.session_state.preferences = {
-            "theme": "light",
-            "result_display": {
-                "expand_sources": True,
-                "show_metadata": True,
-                "max_sources": 5
-            },
-            "notifications": {
-                "enable_sound": False,
-                "enable_toast": True
-            }
-        }
+        _store_preferences(_copy_preferences(_DEFAULT_PREFERENCES))
     
     with st.sidebar.expander("Settings", expanded=False):
         # Theme selection
@@ -30,7 +92,7 @@ def user_preferences():
             horizontal=True,
             key="pref_theme"
         )
-        st.session_state.preferences["theme"] = theme
+        set_preference("theme", theme)
         
         # Results display options
         st.markdown("##### Results Display")
@@ -40,14 +102,14 @@ def user_preferences():
             value=st.session_state.preferences["result_display"]["expand_sources"],
             key="pref_expand_sources"
         )
-        st.session_state.preferences["result_display"]["expand_sources"] = expand_sources
+        set_preference("result_display.expand_sources", expand_sources)
         
         show_metadata = st.checkbox(
             "Show document metadata", 
             value=st.session_state.preferences["result_display"]["show_metadata"],
             key="pref_show_metadata"
         )
-        st.session_state.preferences["result_display"]["show_metadata"] = show_metadata
+        set_preference("result_display.show_metadata", show_metadata)
         
         max_sources = st.slider(
             "Maximum sources to display",
@@ -56,7 +118,7 @@ def user_preferences():
             value=st.session_state.preferences["result_display"]["max_sources"],
             key="pref_max_sources"
         )
-        st.session_state.preferences["result_display"]["max_sources"] = max_sources
+        set_preference("result_display.max_sources", max_sources)
         
         # Notification preferences
         st.markdown("##### Notifications")
@@ -66,22 +128,11 @@ def user_preferences():
             value=st.session_state.preferences["notifications"]["enable_toast"],
             key="pref_enable_toast"
         )
-        st.session_state.preferences["notifications"]["enable_toast"] = enable_toast
+        set_preference("notifications.enable_toast", enable_toast)
         
         # Reset preferences button
         if st.button("Reset to Defaults", key="reset_preferences"):
-            st.session_state.preferences = {
-                "theme": "light",
-                "result_display": {
-                    "expand_sources": True,
-                    "show_metadata": True,
-                    "max_sources": 5
-                },
-                "notifications": {
-                    "enable_sound": False,
-                    "enable_toast": True
-                }
-            }
+            _store_preferences(_copy_preferences(_DEFAULT_PREFERENCES))
             st.rerun()
     
     return st.session_state.preferences
@@ -97,18 +148,10 @@ def get_preference(key_path: str, default: Any = None) -> Any:
     Returns:
         Preference value
     """
-    if "preferences" not in st.session_state:
-        return default
-    
-    parts = key_path.split(".")
-    value = st.session_state.preferences
-    
-    try:
-        for part in parts:
-            value = value[part]
-        return value
-    except (KeyError, TypeError):
+    flat = st.session_state.get("_preferences_flat")
+    if flat is None:
         return default
+    return flat.get(key_path, default)
 
 
 def set_preference(key_path: str, value: Any) -> None:
@@ -121,14 +164,25 @@ def set_preference(key_path: str, value: Any) -> None:
     if "preferences" not in st.session_state:
         user_preferences()  # Initialize preferences
     
-    parts = key_path.split(".")
+    parts = _KEY_PATHS.get(key_path) or tuple(key_path.split("."))
     pref_dict = st.session_state.preferences
+    flat = st.session_state._preferences_flat
     
     # Navigate to the parent object
-    for part in parts[:-1]:
+    for i, part in enumerate(parts[:-1]):
         if part not in pref_dict:
             pref_dict[part] = {}
+            flat[".".join(parts[:i + 1])] = pref_dict[part]
         pref_dict = pref_dict[part]
     
-    # Set the value on the parent object
-    pref_dict[parts[-1]] = value
\ No newline at end of file
+    # Drop the flat entries below a replaced nested preference
+    if isinstance(pref_dict.get(parts[-1]), dict):
+        prefix = key_path + "."
+        for path in [path for path in flat if path.startswith(prefix)]:
+            del flat[path]
+    
+    # Set the value on the parent object and in the flat lookup
+    pref_dict[parts[-1]] = value
+    flat[key_path] = value
+    if isinstance(value, dict):
+        flat.update(_flatten(value, key_path + "."))
\ No newline at end of file
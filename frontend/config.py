@@ -1,28 +1,82 @@
-"""Configuration management for the Exabomination frontend application."""
+"""Configuration management for the Exabomination frontend application.
+
+Settings that come from the environment are loaded once by get_config() and
+are also available as module attributes (API_URL, DEBUG, ...) for existing
+imports. The remaining values are plain constants.
+"""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables from .env.frontend file
-load_dotenv(".env.frontend")
 
-# API Configuration
-API_URL = os.getenv("EXABOMINATION_API_URL", "http://localhost:8888/v1")
-API_KEY = os.getenv("EXABOMINATION_API_KEY", "")
-API_TIMEOUT = int(os.getenv("EXABOMINATION_API_TIMEOUT", "30"))
+def _b(name: str, default: str) -> bool:
+    """Read a boolean flag from the environment ("1" or "true" enable it)."""
+    return os.getenv(name, default).lower() in ("1", "true")
+
+
+@dataclass(frozen=True, slots=True)
+class FrontendConfig:
+    """Frontend settings read from the environment and .env.frontend."""
+    
+    # API Configuration
+    api_url: str
+    api_key: str
+    api_timeout: int
+    
+    # Feature Flags
+    enable_analytics: bool
+    enable_authentication: bool
+    enable_advanced_filters: bool
+    enable_suggestions: bool
+    # Show diagnostic messages in the UI while searching and loading metadata
+    debug: bool
+    
+    # Error Handling
+    enable_mock_fallbacks: bool
+    show_api_errors: bool
+    
+    # Styling
+    theme_primary_color: str
+
+
+@lru_cache(maxsize=1)
+def get_config() -> FrontendConfig:
+    """Load the frontend configuration.
+    
+    The .env.frontend file is only read on the first call.
+    
+    Returns:
+        Frontend configuration
+    """
+    # Load environment variables from .env.frontend file
+    load_dotenv(".env.frontend")
+    
+    return FrontendConfig(
+        api_url=os.getenv("EXABOMINATION_API_URL", "http://localhost:8888/v1"),
+        api_key=os.getenv("EXABOMINATION_API_KEY", ""),
+        api_timeout=int(os.getenv("EXABOMINATION_API_TIMEOUT", "30")),
+        enable_analytics=_b("ENABLE_ANALYTICS", "false"),
+        enable_authentication=_b("ENABLE_AUTHENTICATION", "false"),
+        enable_advanced_filters=_b("ENABLE_ADVANCED_FILTERS", "true"),
+        enable_suggestions=_b("ENABLE_SUGGESTIONS", "true"),
+        debug=_b("EXABOMINATION_FRONTEND_DEBUG", "false"),
+        enable_mock_fallbacks=_b("ENABLE_MOCK_FALLBACKS", "false"),
+        show_api_errors=_b("SHOW_API_ERRORS", "true"),
+        theme_primary_color=os.getenv("STREAMLIT_THEME_PRIMARY_COLOR", "#0066CC")
+    )
+
 
-# Feature Flags
-ENABLE_ANALYTICS = os.getenv("ENABLE_ANALYTICS", "false").lower() == "true"
-ENABLE_AUTHENTICATION = os.getenv("ENABLE_AUTHENTICATION", "false").lower() == "true"
-ENABLE_ADVANCED_FILTERS = os.getenv("ENABLE_ADVANCED_FILTERS", "true").lower() == "true"
-ENABLE_SUGGESTIONS = os.getenv("ENABLE_SUGGESTIONS", "true").lower() == "true"
+def __getattr__(name: str):
+    """Resolve environment settings such as API_URL from get_config()."""
+    field = name.lower()
+    if name.isupper() and field in FrontendConfig.__dataclass_fields__:
+        return getattr(get_config(), field)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Error Handling
-ENABLE_MOCK_FALLBACKS = os.getenv("ENABLE_MOCK_FALLBACKS", "false").lower() == "true"
-SHOW_API_ERRORS = os.getenv("SHOW_API_ERRORS", "true").lower() == "true"
 
 # Styling
-THEME_PRIMARY_COLOR = os.getenv("STREAMLIT_THEME_PRIMARY_COLOR", "#0066CC")
 THEME_SECONDARY_COLOR = "#00A3E0"
 THEME_ACCENT_COLOR = "#FF6B00"
 THEME_BACKGROUND_COLOR = "#F5F7FA"
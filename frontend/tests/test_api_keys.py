@@ -0,0 +1,46 @@
+"""Tests for API key resolution."""
+
+import pytest
+from fastapi import HTTPException
+
+from frontend.api import auth
+from frontend.api.auth import _resolve_api_key, revoke_api_key
+
+
+@pytest.fixture(autouse=True)
+def registered_key(monkeypatch):
+    """Register one API key and reject unknown ones."""
+    monkeypatch.setattr(auth, "DEBUG_MODE", False)
+    auth.api_key_storage.clear()
+    auth.session_profile_cache.clear()
+    _resolve_api_key.cache_clear()
+    auth.api_key_storage["key"] = {
+        "user_id": "usr_1",
+        "account_tier": "standard",
+        "features_enabled": frozenset(["basic_search"])
+    }
+    yield
+    auth.api_key_storage.clear()
+    auth.session_profile_cache.clear()
+    _resolve_api_key.cache_clear()
+
+
+def test_resolve_returns_stored_user_info():
+    assert _resolve_api_key("key") is auth.api_key_storage["key"]
+
+
+def test_unknown_key_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        _resolve_api_key("unknown")
+    assert exc_info.value.status_code == 401
+
+
+def test_revoked_key_is_rejected():
+    _resolve_api_key("key")
+    auth._session_profile("key", 0.0)
+    
+    revoke_api_key("key")
+    
+    assert "key" not in auth.session_profile_cache
+    with pytest.raises(HTTPException):
+        _resolve_api_key("key")
@@ -0,0 +1,142 @@
+"""Tests for the in-memory token bucket rate limiter."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from frontend.api import auth
+from frontend.api.auth import (
+    ADMITTED,
+    RATE_LIMITED,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_REFILL_RATE,
+    RateLimitMiddleware,
+    _admit_request,
+    _refill_tokens,
+)
+
+NOW = 1_700_000_000.0
+
+
+class FailingRedisError(Exception):
+    """Stands in for redis.exceptions.RedisError."""
+
+
+class FailingNoScriptError(FailingRedisError):
+    """Stands in for redis.exceptions.NoScriptError."""
+
+
+class FailingRedis:
+    """Redis client whose every command fails as if the server were down."""
+    
+    async def evalsha(self, *args):
+        raise FailingRedisError("Connection refused")
+    
+    async def decr(self, key):
+        raise FailingRedisError("Connection refused")
+
+
+@pytest.fixture(autouse=True)
+def in_memory_buckets(monkeypatch):
+    """Use empty in-memory buckets and a fixed clock."""
+    monkeypatch.setattr(auth, "redis_client", None)
+    monkeypatch.setattr(auth.time, "time", lambda: NOW)
+    auth.rate_limit_storage.clear()
+    auth.concurrent_request_count.clear()
+    yield
+    auth.rate_limit_storage.clear()
+    auth.concurrent_request_count.clear()
+
+
+def _drain(api_key: str, now: float):
+    """Admit requests until the bucket is empty."""
+    for _ in range(int(RATE_LIMIT_CAPACITY)):
+        status, _, shared = asyncio.run(_admit_request(api_key, now))
+        assert status == ADMITTED
+        asyncio.run(auth._release_request(api_key, shared))
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    
+    @app.get("/v1/ping")
+    async def ping():
+        return {"ok": True}
+    
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+    
+    return TestClient(app)
+
+
+def test_new_key_starts_with_full_bucket():
+    assert _refill_tokens("key", NOW) == RATE_LIMIT_CAPACITY
+
+
+def test_refill_after_time_passes():
+    _drain("key", NOW)
+    assert _refill_tokens("key", NOW) < 1
+    
+    assert _refill_tokens("key", NOW + 10) == pytest.approx(10 * RATE_LIMIT_REFILL_RATE)
+
+
+def test_refill_is_capped_at_burst_size():
+    status, tokens, _ = asyncio.run(_admit_request("key", NOW))
+    assert status == ADMITTED
+    assert tokens == RATE_LIMIT_CAPACITY - 1
+    
+    assert _refill_tokens("key", NOW + 3600) == RATE_LIMIT_CAPACITY
+
+
+def test_empty_bucket_is_rate_limited():
+    _drain("key", NOW)
+    
+    status, tokens, _ = asyncio.run(_admit_request("key", NOW))
+    assert status == RATE_LIMITED
+    assert tokens < 1
+
+
+def test_middleware_returns_429_once_bucket_is_empty(client):
+    _drain("key", NOW)
+    
+    response = client.get("/v1/ping", headers={"Authorization": "Bearer key"})
+    assert response.status_code == 429
+    assert response.json()["error"]["code"] == "rate_limit_exceeded"
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_middleware_sets_rate_limit_headers(client):
+    response = client.get("/v1/ping", headers={"Authorization": "Bearer key"})
+    assert response.status_code == 200
+    assert response.headers["X-Rate-Limit-Remaining"] == str(int(RATE_LIMIT_CAPACITY) - 1)
+
+
+def test_exempt_paths_are_not_limited(client):
+    _drain("key", NOW)
+    
+    response = client.get("/health", headers={"Authorization": "Bearer key"})
+    assert response.status_code == 200
+    assert "X-Rate-Limit-Remaining" not in response.headers
+    assert _refill_tokens("key", NOW) < 1
+
+
+def test_redis_failure_falls_back_to_in_memory_bucket(client, monkeypatch):
+    monkeypatch.setattr(auth, "redis_client", FailingRedis())
+    monkeypatch.setattr(auth, "RedisError", FailingRedisError)
+    monkeypatch.setattr(auth, "NoScriptError", FailingNoScriptError)
+    
+    status, tokens, shared = asyncio.run(_admit_request("key", NOW))
+    assert (status, shared) == (ADMITTED, False)
+    assert tokens == RATE_LIMIT_CAPACITY - 1
+    
+    # Releasing a slot held in Redis only logs the failure
+    asyncio.run(auth._release_request("key", True))
+    
+    response = client.get("/v1/ping", headers={"Authorization": "Bearer key"})
+    assert response.status_code == 200
+    assert response.headers["X-Rate-Limit-Remaining"] == str(int(RATE_LIMIT_CAPACITY) - 2)
@@ -0,0 +1,55 @@
+"""Tests for the semantic answer cache."""
+
+import pytest
+
+from frontend.api import semantic_cache
+from frontend.api.semantic_cache import SemanticAnswerCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic."""
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_on_similar_query(clock):
+    cache = SemanticAnswerCache(capacity=4, threshold=0.9, ttl=60)
+    cache.add([1.0, 0.0], b"A", {"answer": "a"})
+    
+    assert cache.get([0.99, 0.01], b"A") == {"answer": "a"}
+    assert cache.get([0.0, 1.0], b"A") is None
+
+
+def test_params_mismatch_does_not_hide_eligible_entry(clock):
+    cache = SemanticAnswerCache(capacity=4, threshold=0.9, ttl=60)
+    cache.add([1.0, 0.0], b"A", {"answer": "a"})
+    cache.add([0.99, 0.01], b"B", {"answer": "b"})
+    
+    assert cache.get([1.0, 0.0], b"B") == {"answer": "b"}
+    assert cache.get([1.0, 0.0], b"C") is None
+
+
+def test_expired_entry_does_not_hide_fresh_one(clock):
+    cache = SemanticAnswerCache(capacity=4, threshold=0.9, ttl=60)
+    cache.add([1.0, 0.0], b"A", {"answer": "old"})
+    clock[0] += 50
+    cache.add([0.99, 0.01], b"A", {"answer": "new"})
+    clock[0] += 20
+    
+    assert cache.get([1.0, 0.0], b"A") == {"answer": "new"}
+    clock[0] += 50
+    assert cache.get([1.0, 0.0], b"A") is None
+
+
+def test_ring_buffer_overwrites_oldest(clock):
+    cache = SemanticAnswerCache(capacity=2, threshold=0.9, ttl=60)
+    cache.add([1.0, 0.0], b"A", {"answer": "first"})
+    cache.add([0.0, 1.0], b"A", {"answer": "second"})
+    cache.add([1.0, 1.0], b"A", {"answer": "third"})
+    
+    assert len(cache) == 2
+    assert cache.get([1.0, 0.0], b"A") is None
+    assert cache.get([0.0, 1.0], b"A") == {"answer": "second"}
+    assert cache.get([1.0, 1.0], b"A") == {"answer": "third"}
@@ -0,0 +1,39 @@
+"""Tests for the batched SQLite writer."""
+
+import asyncio
+import sqlite3
+
+from frontend.api.storage import BatchedSQLiteWriter
+
+
+def test_close_writes_queued_rows(tmp_path):
+    db_path = tmp_path / "api.db"
+    
+    async def write_rows():
+        writer = BatchedSQLiteWriter(str(db_path), batch_size=2, interval=0.01)
+        writer.submit("query_history", ("req_1", "usr_1", "first query", "2024-01-01T00:00:00", 3))
+        writer.submit("query_history", ("req_2", "usr_1", "second query", "2024-01-01T00:00:01", 0))
+        writer.submit("query_history", ("req_3", "usr_2", "third query", "2024-01-01T00:00:02", 5))
+        writer.submit("feedback", ("fb_1", "req_1", "usr_1", "positive", None, "[]", None, "2024-01-01T00:00:03"))
+        await writer.close()
+    
+    asyncio.run(write_rows())
+    
+    conn = sqlite3.connect(db_path)
+    try:
+        history = conn.execute("SELECT request_id, query, doc_count FROM query_history ORDER BY request_id").fetchall()
+        feedback = conn.execute("SELECT feedback_id, rating FROM feedback").fetchall()
+    finally:
+        conn.close()
+    
+    assert history == [("req_1", "first query", 3), ("req_2", "second query", 0), ("req_3", "third query", 5)]
+    assert feedback == [("fb_1", "positive")]
+
+
+def test_close_without_rows(tmp_path):
+    db_path = tmp_path / "api.db"
+    writer = BatchedSQLiteWriter(str(db_path))
+    
+    asyncio.run(writer.close())
+    
+    assert not db_path.exists()
@@ -29,6 +29,8 @@ VOYAGE_API_KEY = os.getenv("VOYAGE_API_KEY")  # Must be set in .env file
 # Rate limiting settings
 API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", "60"))  # Max requests per minute
 API_CONCURRENT_LIMIT = int(os.getenv("API_CONCURRENT_LIMIT", "5"))  # Max concurrent requests
+REDIS_URL = os.getenv("REDIS_URL")  # Shared rate limit state across workers (optional)
+API_STORAGE_DB_PATH = os.getenv("API_STORAGE_DB_PATH", str(DATA_DIR / "api_storage.db"))  # Feedback and query history
 
 # Application settings
 DEBUG_MODE = os.getenv("DEBUG_MODE", "False").lower() in ("true", "t", "1")
@@ -37,6 +39,11 @@ APP_PORT = int(os.getenv("APP_PORT", "8080"))
 
 # Web interface settings
 API_BASE_URL = os.getenv("API_BASE_URL", f"http://localhost:{APP_PORT}")
+CORS_ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:8501").split(",")
+    if origin.strip()
+]
 
 # Model settings
 EMBEDDING_MODELS = {
@@ -56,6 +63,7 @@ CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 TOP_K_RETRIEVAL = 10
 RERANKER_THRESHOLD = 0.7
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))  # Min cosine similarity to reuse an answer
 
 def get_config() -> Dict[str, Any]:
     """Return all configuration as a dictionary."""
@@ -69,6 +77,8 @@ def get_config() -> Dict[str, Any]:
         "log_level": LOG_LEVEL,
         "app_port": APP_PORT,
         "api_base_url": API_BASE_URL,
+        "cors_allowed_origins": CORS_ALLOWED_ORIGINS,
+        "api_storage_db_path": API_STORAGE_DB_PATH,
         "embedding_models": EMBEDDING_MODELS,
         "default_embedding_model": DEFAULT_EMBEDDING_MODEL,
         "llm_model": LLM_MODEL,
@@ -78,4 +88,5 @@ def get_config() -> Dict[str, Any]:
         "chunk_overlap": CHUNK_OVERLAP,
         "top_k_retrieval": TOP_K_RETRIEVAL,
         "reranker_threshold": RERANKER_THRESHOLD,
+        "semantic_cache_threshold": SEMANTIC_CACHE_THRESHOLD,
     }
@@ -63,7 +63,8 @@ class QueryEngine:
         filter: Optional[Dict[str, Any]] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        query_embedding: Optional[List[float]] = None
     ) -> Dict[str, Any]:
         """Process a query and return a response with context.
         
@@ -73,6 +74,7 @@ class QueryEngine:
             max_tokens: Optional maximum tokens for response
             temperature: Optional temperature for response generation
             use_cache: Whether to use cached results for identical queries
+            query_embedding: Optional precomputed embedding of the processed query
             
         Returns:
             Dictionary with response, context, documents, and timing information
@@ -90,7 +92,8 @@ class QueryEngine:
         retrieval_start = time.time()
         documents = self.retriever.retrieve(
             query=query,
-            filter=filter
+            filter=filter,
+            query_embedding=query_embedding
         )
         retrieval_time = time.time() - retrieval_start
         
@@ -104,12 +104,19 @@ class Retriever:
         
         logger.info(f"Initialized retriever with top_k={top_k}, hybrid_weight={hybrid_search_weight}")
 
-    def retrieve(self, query: str, filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+    def retrieve(
+        self,
+        query: str,
+        filter: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Document]:
         """Retrieve relevant documents for a query using hybrid search.
 
         Args:
             query: The search query
             filter: Optional metadata filters
+            query_embedding: Optional precomputed embedding of the processed
+                query, to avoid embedding it again
 
         Returns:
             List of relevant documents
@@ -140,15 +147,15 @@ class Retriever:
         
         # Hybrid search
         if self.enable_hybrid_search:
-            results = self._hybrid_search(processed_query, query_type, combined_filter)
+            results = self._hybrid_search(processed_query, query_type, combined_filter, query_embedding)
         else:
             # Vector-only search
-            results = self._vector_search(processed_query, query_type, combined_filter)
+            results = self._vector_search(processed_query, query_type, combined_filter, query_embedding=query_embedding)
             
         # If no results, try fallback strategies
         if not results:
             logger.warning(f"No results found for '{query}', trying fallback strategies")
-            results = self._fallback_search(query, processed_query, query_type, combined_filter)
+            results = self._fallback_search(query, processed_query, query_type, combined_filter, query_embedding)
 
         # Ensure we have diverse results
         if results:
@@ -182,7 +189,8 @@ class Retriever:
         query: str, 
         query_type: str, 
         filter: Optional[Dict[str, Any]] = None,
-        k: Optional[int] = None
+        k: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Document]:
         """Perform vector search using appropriate embedding model.
         
@@ -191,12 +199,14 @@ class Retriever:
             query_type: Type of query ('text' or 'code')
             filter: Optional metadata filters
             k: Number of results to retrieve (defaults to self.top_k)
+            query_embedding: Optional precomputed embedding of the query
             
         Returns:
             List of relevant documents
         """
         # Get query embedding using the appropriate model
-        query_embedding = self.query_processor.embed_query(query)
+        if query_embedding is None:
+            query_embedding = self.query_processor.embed_query(query)
         
         # If k is not provided, use top_k * 2 to allow for post-processing
         search_k = k or (self.top_k * 2)
@@ -283,7 +293,8 @@ class Retriever:
         self, 
         query: str, 
         query_type: str,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Document]:
         """Combine vector and keyword search for improved results.
         
@@ -291,12 +302,13 @@ class Retriever:
             query: Processed query text
             query_type: Type of query ('text' or 'code')
             filter: Optional metadata filters
+            query_embedding: Optional precomputed embedding of the query
             
         Returns:
             List of relevant documents
         """
         # Get vector search results
-        vector_results = self._vector_search(query, query_type, filter, k=self.top_k * 2)
+        vector_results = self._vector_search(query, query_type, filter, k=self.top_k * 2, query_embedding=query_embedding)
         
         # Get keyword search results
         keyword_results = self._keyword_search(query, filter, k=self.top_k * 2)
@@ -352,7 +364,8 @@ class Retriever:
         original_query: str,
         processed_query: str,
         query_type: str,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Document]:
         """Implement fallback strategies when main search returns no results.
         
@@ -361,6 +374,7 @@ class Retriever:
             processed_query: The processed query text
             query_type: Type of query ('text' or 'code')
             filter: Optional metadata filters
+            query_embedding: Optional precomputed embedding of the processed query
             
         Returns:
             List of relevant documents from fallback strategies
@@ -377,7 +391,7 @@ class Retriever:
         # Strategy 2: Try with relaxed filters
         if filter:
             logger.info(f"Fallback: Trying search without filters")
-            fallback_results = self._vector_search(processed_query, query_type, filter=None)
+            fallback_results = self._vector_search(processed_query, query_type, filter=None, query_embedding=query_embedding)
             if fallback_results:
                 return fallback_results
         